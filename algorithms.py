@@ -1,85 +1,445 @@
+import heapq
+import time
+
 import numpy as np
 
+import models
+import spatial
+
+class ExtremePoints:
+    """Aday nokta (Extreme Point) yöneticisi.
+
+    Noktalar duvar örme sırasına göre (y, z, x) bir heap'te tutulur, üyelik
+    kontrolü set ile yapılır. Bir kutunun içinde kalan (gömülen) noktalar ve
+    kalan hiçbir ürünün sığamayacağı noktalar ziyaret sırasında atılır.
+
+    Noktalar arası baskınlık (dominance) budaması bilerek yapılmaz: paketleyici
+    duvar sırasındaki ilk uygun noktayı seçer ve bir noktada sığan kutu onu
+    baskılayan noktada çarpışabilir ya da desteksiz kalabilir. Baskılanan
+    noktayı atmak seçilen noktayı, dolayısıyla planı değiştirir. Sadece hiçbir
+    yerleşime aday olamayacak noktalar atılır.
+    """
+    def __init__(self, dims, index):
+        self.dims = dims
+        self.index = index
+        self.heap = []
+        self.live = {} # (x, y, z) -> son doğrulandığında indeksteki kutu sayısı
+        self.limits = list(dims) # Bu koordinatların ötesine hiçbir ürün sığmaz
+
+    def __len__(self):
+        return len(self.live)
+
+    def add(self, point):
+        key = (point[0], point[1], point[2])
+        if (key[0] < self.dims[0] and key[1] < self.dims[1] and key[2] < self.dims[2]):
+            if key not in self.live:
+                self.live[key] = -1
+                heapq.heappush(self.heap, (key[1], key[2], key[0]))
+
+    def discard(self, point):
+        # Heap'ten silme tembel: ziyaret sırasında atlanır
+        self.live.pop((point[0], point[1], point[2]), None)
+
+    def prune(self, min_dims):
+        """Kalan ürünlerin en küçük ölçülerine göre limitleri daraltır."""
+        self.limits = [self.dims[a] - min_dims[a] for a in range(3)]
+
+    def _alive(self, key):
+        stamp = self.live.get(key)
+        if stamp is None: return False
+        if key[0] > self.limits[0] or key[1] > self.limits[1] or key[2] > self.limits[2]:
+            del self.live[key]
+            return False
+        n_boxes = len(self.index.boxes)
+        if stamp < n_boxes:
+            if self.index.contains_point(key):
+                del self.live[key] # Bir kutunun içinde kaldı
+                return False
+            self.live[key] = n_boxes
+        return True
+
+    def search(self, fn):
+        """Noktaları sırayla `fn`e verir, ilk None olmayan sonucu döndürür."""
+        heap = self.heap
+        visited = []
+        result = None
+        try:
+            while heap:
+                entry = heapq.heappop(heap)
+                key = (entry[2], entry[0], entry[1])
+                if not self._alive(key): continue
+                visited.append(entry)
+                result = fn(list(key))
+                if result is not None: break
+        finally:
+            for entry in visited:
+                heapq.heappush(heap, entry)
+        return result
+
+    def ordered(self):
+        """Canlı noktaları sıralı (n, 3) dizi olarak döndürür.
+
+        Limit budaması uygulanır; gömülü nokta kontrolü çağırana bırakılır
+        (toplu motor bunu vektörel yapar).
+        """
+        live, lim = self.live, self.limits
+        entries = []
+        for entry in self.heap:
+            key = (entry[2], entry[0], entry[1])
+            if key not in live: continue
+            if key[0] > lim[0] or key[1] > lim[1] or key[2] > lim[2]:
+                del live[key]
+                continue
+            entries.append(entry)
+        entries.sort()
+        self.heap = entries # Sıralı liste zaten geçerli bir heap
+        if not entries: return np.zeros((0, 3))
+        return np.array(entries)[:, [2, 0, 1]]
+
+ENGINES = ("scalar", "batch")
+
+# Rastgele varyantlarda bu oran içindeki hacim/yoğunluk farkları eşitlik sayılır
+TIE_TOLERANCE = 0.10
+
 class Packer:
-    def __init__(self, container):
+    def __init__(self, container, index="grid", engine="scalar", batch_size=256, blocks=False, stats=None):
         self.container = container
+        # Çarpışma sorguları için uzamsal indeks ("grid", "brute" ya da özel sınıf)
+        self.index_type = index
+        # "scalar": noktaları tek tek dener, "batch": tüm noktaları NumPy ile birlikte test eder
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        self.engine = engine
+        self.batch_size = batch_size
+        # Aynı SKU'ları blok (ör. 2x3x2) halinde tek adımda yerleştir
+        self.blocks = blocks
+        self._build_index()
+        # İsteğe bağlı ölçüm (instrumentation.PackStats); kapalıyken hiçbir metot sarmalanmaz
+        self.stats = stats
+        self._axle_limits = None
+        if stats is not None:
+            import instrumentation
+            instrumentation.attach(self, stats)
 
-    def pack(self, items, strategy="balanced"):
+    def make_points(self, dims, index):
+        return ExtremePoints(dims, index)
+
+    def _build_index(self):
+        self.index = spatial.make_index(self.index_type, self.container.dims)
+        placements = self.container.placements
+        for n, (pos, dims) in enumerate(zip(placements.pos.tolist(), placements.dims.tolist())):
+            self.index.insert(pos, dims, n)
+
+    def loading_order(self, items, strategy="balanced", seed=None):
+        """Strateji sıralamasına göre tablo satır indeksleri (yükleme sırası)."""
+        if len(items) == 0:
+            return np.zeros(0, dtype=np.int64)
         # 1. STRATEJİ BELİRLEME (Sıralama Algoritması)
         # LIFO (Last In First Out) + Hacim + Yoğunluk
+        # lexsort kararlıdır: eşit anahtarlar manifest sırasını korur
+        volume = items.volume
+        density = items.weight / items.volume
+        keys = [np.arange(len(items))]
+        if seed is not None:
+            # Rastgele eşitlik bozma: ~%10 yakın hacim/yoğunluklar eşit sayılır ve
+            # SKU'lar (özdeş birim grupları) bu eşitlikler içinde karıştırılır
+            volume = np.floor(np.log(volume) / np.log(1 + TIE_TOLERANCE))
+            density = np.floor(np.log(density) / np.log(1 + TIE_TOLERANCE))
+            sku = np.unique(np.column_stack([items.dims, items.weight, items.stop_order, items.fragile, items.can_rotate]),
+                            axis=0, return_inverse=True)[1].ravel()
+            keys.append(np.random.default_rng(seed).permutation(sku.max() + 1)[sku])
         if strategy == "Density":
             # Yoğunluk (kg/m3) yüksek olanları alta koymaya çalış
-            items.sort(key=lambda x: (x.stop_order, x.weight/x.volume, x.volume), reverse=True)
-        else:
-            # Standart: Önce son durak, sonra büyük hacim
-            items.sort(key=lambda x: (x.stop_order, x.volume), reverse=True)
+            return np.lexsort(keys + [-volume, -density, -items.stop_order])
+        # Standart: Önce son durak, sonra büyük hacim
+        return np.lexsort(keys + [-volume, -items.stop_order])
+
+    def pack(self, items, strategy="balanced", seed=None, order=None, stop_at=None):
+        """Birimleri yükleme sırasıyla yerleştirir.
+
+        stop_at (time.monotonic() zamanı) verilirse o andan sonra yeni birim
+        denenmez; o ana kadarki kısmi plan kalır (süre sınırlı aramalar için).
+        """
+        if not isinstance(items, models.ItemTable):
+            # Eski arayüz: Item listesi tabloya çevrilir, sonuç Item'lara geri yazılır
+            table = models.ItemTable.from_items(items)
+            self.pack(table, strategy, seed, order, stop_at)
+            for item, pos, rot in zip(items, table.position, table.rotation.tolist()):
+                item.position = pos
+                item.rotation_type = rot
+            return
+
+        self.container.placements.bind(items)
+        # Dingil sınırları verilmişse her yerleşimde kontrol edilir (yoksa iç döngüye hiç girmez)
+        front_limit, rear_limit = self.container.axle_front_limit, self.container.axle_rear_limit
+        self._axle_limits = None if front_limit is None and rear_limit is None else (front_limit, rear_limit)
+        # order verilirse strateji sıralaması yerine o sıra kullanılır
+        order = self.loading_order(items, strategy, seed) if order is None else np.asarray(order, dtype=np.int64)
+
+        # Konteynerde önceden yüklü kutular olabilir, indeksi tazele
+        self._build_index()
+
+        # Extreme Points mantığıyla aday nokta yönetimi
+        self.points = self.make_points(self.container.dims, self.index)
+        self.points.add([0, 0, 0])
+        for pos, dims in zip(self.container.placements.pos.tolist(), self.container.placements.dims.tolist()):
+            self._add_extreme_points(pos, dims)
+
+        # Kalan ürünlerin en küçük ölçüleri (noktaları budamak için)
+        d = items.dims[order]
+        side = np.where(items.can_rotate[order], d[:, :2].min(axis=1), np.inf)
+        suffix_min = np.stack([np.minimum(side, d[:, 0]), np.minimum(side, d[:, 1]), d[:, 2]], axis=1)
+        suffix_min = np.minimum.accumulate(suffix_min[::-1], axis=0)[::-1].tolist()
+
+        # İç döngüde NumPy skalerleri yerine düz Python listeleri
+        dims = items.dims.tolist()
+        can_rotate = items.can_rotate.tolist()
+        weight = items.weight.tolist()
 
-        # Extreme Points mantığına benzer aday nokta yönetimi
-        candidate_points = [[0, 0, 0]]
+        # Aynı SKU grupları: sıralamada art arda gelen özdeş birimler
+        runs = self._identical_runs(items, order)
+        order = order.tolist()
 
-        for item in items:
-            placed = False
+        # Tonaj kapasitesi (max_weight) takibi
+        max_weight = self.container.max_weight
+        loaded = float(self.container.placements.weight.sum())
+
+        n = 0
+        while n < len(order):
+            if stop_at is not None and time.monotonic() > stop_at:
+                break # Süre doldu: kısmi plan
+            row = order[n]
+            run_end = runs[n]
+            if max_weight is not None and weight[row] > 0:
+                # Kapasiteyi aşacak birimler yüklenmez (özdeş birimler de aşar)
+                fits_weight = int((max_weight - loaded) // weight[row])
+                if fits_weight <= 0:
+                    n = run_end
+                    continue
+                run_end = min(run_end, n + fits_weight)
+            self.points.prune(suffix_min[n])
             
             # --- DUVAR ÖRME & ZEMİN ÖNCELİĞİ ---
             # 1. Y (Derinlik - Tırın arkası)
             # 2. Z (Yükseklik - Zemin)
             # 3. X (Genişlik)
-            candidate_points.sort(key=lambda p: (p[1], p[2], p[0]))
-
-            for point in candidate_points:
-                # İki yönü de dene (Eğer ürün döndürülebiliyorsa)
-                rotations_to_try = [0, 1] if item.can_rotate else [0]
-                
-                for rot in rotations_to_try:
-                    current_dims = item.dims if rot == 0 else [item.dims[1], item.dims[0], item.dims[2]]
-                    
-                    # 1. Sığma Kontrolü
-                    if self._can_place(point, current_dims):
-                        # 2. Fizik Kontrolü (Destek + Kırılganlık)
-                        if self._is_physically_valid(point, current_dims, item.weight):
-                            
-                            # YERLEŞTİR
-                            item.position = point
-                            item.rotation_type = rot
-                            self.container.placed_items.append(item)
-                            
-                            candidate_points.remove(point)
-                            
-                            # Yeni aday noktalar (Extreme Point mantığıyla)
-                            self._add_candidate(candidate_points, [point[0] + current_dims[0], point[1], point[2]]) # Sağ
-                            self._add_candidate(candidate_points, [point[0], point[1] + current_dims[1], point[2]]) # Ön
-                            self._add_candidate(candidate_points, [point[0], point[1], point[2] + current_dims[2]]) # Üst
-                            
-                            placed = True
-                            break 
-                if placed: break
+            if self.engine == "batch":
+                found = self._batch_search(dims[row], can_rotate[row], weight[row])
+            else:
+                found = self.points.search(lambda point: self._try_point(point, dims[row], can_rotate[row], weight[row]))
             
-            if not placed:
-                pass # Dışarıda kaldı
+            if found is None:
+                # Dışarıda kaldı; konteyner değişmediği için özdeş birimler de sığmaz
+                n = runs[n]
+                continue
 
-    def calculate_axle_loads(self):
-        """Moment prensibiyle (M=F*d) ön ve arka dingil yüklerini hesaplar."""
-        total_weight = sum([i.weight for i in self.container.placed_items])
-        if total_weight == 0: return 0, 0
-        
-        total_moment = 0
-        for item in self.container.placed_items:
-            # Kutunun ağırlık merkezi Y ekseninin ortasıdır
-            cog_y = item.position[1] + (item.get_dimension()[1] / 2)
-            total_moment += item.weight * cog_y
+            point, rot, current_dims = found
+            shape = [1, 1, 1]
+            if self.blocks and run_end - n > 1:
+                shape = self._block_shape(point, current_dims, run_end - n, items.fragile[row], weight[row])
             
-        # Yükün ağırlık merkezi (Center of Gravity)
-        load_cog = total_moment / total_weight
-        
-        # Dingil mesafesi
-        wheelbase = self.container.axle_rear_pos - self.container.axle_front_pos
+            # Blok içindeki birimler duvar örme sırasıyla (y, z, x)
+            for j in range(shape[1]):
+                for k in range(shape[2]):
+                    for i in range(shape[0]):
+                        unit_point = [point[0] + i * current_dims[0], point[1] + j * current_dims[1], point[2] + k * current_dims[2]]
+                        self._place(order[n], unit_point, rot, current_dims)
+                        n += 1
+            loaded += weight[row] * shape[0] * shape[1] * shape[2]
+
+    def _identical_runs(self, items, order):
+        """Her sıra pozisyonu için, özdeş birimlerden oluşan grubun bitiş pozisyonu."""
+        columns = [items.dims[order], items.weight[order, None], items.stop_order[order, None],
+                   items.fragile[order, None], items.can_rotate[order, None]]
+        same = np.ones(max(len(order) - 1, 0), dtype=bool)
+        for col in columns:
+            same &= np.all(col[1:] == col[:-1], axis=1)
+        starts = np.flatnonzero(np.concatenate([[True], ~same]))
+        ends = np.append(starts[1:], len(order))
+        return np.repeat(ends, ends - starts).tolist()
+
+    def _block_shape(self, point, dims, remaining, fragile, weight=0):
+        """Noktada kurulabilecek en büyük özdeş kutu bloğu [nx, ny, nz].
+
+        Önce genişlik (x), sonra yükseklik (z), sonra derinlik (y) büyütülür.
+        Bloğun hacmi çarpışmasız olmalı ve alt katmandaki her birim destek
+        kuralını sağlamalı; üst katmanlar alttaki birimlere tam oturur.
+        """
+        C = self.container.dims
+        free = [int((C[a] - point[a]) // dims[a]) for a in range(3)]
+
+        def bottom_ok(i0, i1, j0, j1):
+            if point[2] == 0: return True
+            return all(self._is_physically_valid([point[0] + i * dims[0], point[1] + j * dims[1], point[2]], dims, None)
+                       for i in range(i0, i1) for j in range(j0, j1))
+
+        def fits(nx, ny, nz):
+            return not self.index.collides(point, [nx * dims[0], ny * dims[1], nz * dims[2]])
+
+        nx = next((k for k in range(min(free[0], remaining), 1, -1)
+                   if fits(k, 1, 1) and bottom_ok(1, k, 0, 1)), 1)
+        # Kırılgan ürünlerin üstüne birim konmaz
+        nz_max = 1 if fragile else min(free[2], remaining // nx)
+        nz = next((k for k in range(nz_max, 1, -1) if fits(nx, 1, k)), 1)
+        ny = next((k for k in range(min(free[1], remaining // (nx * nz)), 1, -1)
+                   if fits(nx, k, nz) and bottom_ok(0, nx, 1, k)), 1)
+        if self._axle_limits is not None and nx * ny * nz > 1:
+            # Blok dingil sınırını aşıyorsa sadece (zaten kontrol edilmiş) tek birim yerleşir
+            block_weight = weight * nx * ny * nz
+            if not self._axle_ok(block_weight, block_weight * (point[1] + ny * dims[1] / 2)):
+                return [1, 1, 1]
+        return [nx, ny, nz]
+
+    def _place(self, row, point, rot, current_dims):
+        # YERLEŞTİR
+        n = self.container.placements.add(row, point, rot)
+        self.index.insert(point, current_dims, n)
         
-        # Arka aksa binen yük (Moment kolu kuralı)
-        dist_from_front = load_cog - self.container.axle_front_pos
-        rear_load = total_weight * (dist_from_front / wheelbase)
-        front_load = total_weight - rear_load
+        self.points.discard(point)
+        self._add_extreme_points(point, current_dims)
+
+    def _try_point(self, point, dims, can_rotate, weight):
+        # İki yönü de dene (Eğer ürün döndürülebiliyorsa)
+        rotations_to_try = [0, 1] if can_rotate else [0]
         
-        return front_load, rear_load
+        for rot in rotations_to_try:
+            current_dims = dims if rot == 0 else [dims[1], dims[0], dims[2]]
+            
+            # 1. Sığma Kontrolü
+            if self._can_place(point, current_dims):
+                # 2. Fizik Kontrolü (Destek + Kırılganlık)
+                if self._is_physically_valid(point, current_dims, weight):
+                    # 3. Dingil yükü sınırları (tanımlıysa)
+                    if self._axle_limits is None or self._axle_ok(weight, weight * (point[1] + current_dims[1] / 2)):
+                        return point, rot, current_dims
+        return None
+
+    def _batch_search(self, dims, can_rotate, weight=0):
+        """Ürünü (iki yönüyle) tüm aday noktalara karşı vektörel test eder.
+
+        Noktalar sıralı gruplar halinde işlenir; ilk uygun nokta bulununca
+        durulur. Sonuç skaler motorla aynı (nokta, rotasyon) seçimidir.
+        """
+        all_points = self.points.ordered()
+        placements = self.container.placements
+        lo = placements.pos
+        hi = lo + placements.dims
+        fragile = placements.fragile
+        rotations = [0, 1] if can_rotate else [0]
+        rot_dims = [np.array(dims), np.array([dims[1], dims[0], dims[2]])]
+
+        for start in range(0, len(all_points), self.batch_size):
+            P = all_points[start:start + self.batch_size]
+            # Bu gruba değebilecek kutular (destek için üst yüzey toleransı payıyla;
+            # 0.1cm sınırındaki kutular kayan nokta farkıyla dışarıda kalmasın)
+            reach = np.max(rot_dims[:len(rotations)], axis=0)
+            near = np.all(lo < P.max(axis=0) + reach, axis=1) & np.all(hi > P.min(axis=0) - [0, 0, 0.2], axis=1)
+            l, h, f = lo[near], hi[near], fragile[near]
+
+            # Bir kutunun içinde kalan noktalar hiçbir zaman kullanılamaz
+            buried = np.any(np.all((l[None] <= P[:, None]) & (P[:, None] < h[None]), axis=2), axis=1)
+            for point in P[buried].tolist():
+                self.points.discard(point)
+
+            feasible = np.zeros((len(P), 2), dtype=bool)
+            for rot in rotations:
+                feasible[:, rot] = ~buried & self._batch_feasible(P, rot_dims[rot], l, h, f)
+                if self._axle_limits is not None:
+                    feasible[:, rot] &= self._axle_ok(weight, weight * (P[:, 1] + rot_dims[rot][1] / 2))
+
+            # Satır öncelikli sıra: önce nokta, sonra rotasyon (skaler döngüyle aynı)
+            hits = np.flatnonzero(feasible)
+            if len(hits):
+                i, rot = divmod(int(hits[0]), 2)
+                return P[i].tolist(), rot, rot_dims[rot].tolist()
+        return None
+
+    def _batch_feasible(self, P, d, lo, hi, fragile):
+        # 1. Sığma Kontrolü (sınırlar + AABB çarpışma)
+        ok = np.all(P + d <= self.container.dims, axis=1)
+        P0, P1 = P[:, None], (P + d)[:, None]
+        ok &= ~np.any(np.all((P0 < hi[None]) & (P1 > lo[None]), axis=2), axis=1)
+
+        # 2. Fizik Kontrolü (Destek + Kırılganlık), zemindekiler hariç
+        touching = np.abs(hi[None, :, 2] - P[:, None, 2]) < 0.1
+        x_overlap = np.clip(np.minimum(P1[..., 0], hi[None, :, 0]) - np.maximum(P0[..., 0], lo[None, :, 0]), 0, None)
+        y_overlap = np.clip(np.minimum(P1[..., 1], hi[None, :, 1]) - np.maximum(P0[..., 1], lo[None, :, 1]), 0, None)
+        area = np.where(touching, x_overlap * y_overlap, 0)
+        on_fragile = np.any((area > 0) & fragile[None], axis=1)
+        stable = area.sum(axis=1) / (d[0] * d[1]) >= 0.60
+        return ok & ((P[:, 2] == 0) | (~on_fragile & stable))
+
+    def _add_extreme_points(self, point, dims):
+        # Yeni aday noktalar (Extreme Point mantığıyla)
+        self.points.add([point[0] + dims[0], point[1], point[2]]) # Sağ
+        self.points.add([point[0], point[1] + dims[1], point[2]]) # Ön
+        self.points.add([point[0], point[1], point[2] + dims[2]]) # Üst
+
+    def repack(self, added=None, removed=(), strategy="balanced"):
+        """Mevcut plana ürün ekler/çıkarır; sadece etkilenen bölgeyi yeniden planlar.
+
+        Yükleme sırasında ilk etkilenen noktaya kadar olan yerleşimler (ör. daha
+        sonraki durakların yükü) sabit kalır; o noktadan sonrası, eklenen ürünler
+        ve önceden sığmayanlarla birlikte yeniden paketlenir. `removed` mevcut
+        tablonun satır numaralarıdır. Yeni ItemTable döndürülür (konteyner ona bağlanır).
+        """
+        placements = self.container.placements
+        old = placements.items
+        if old is None:
+            old = added.take([]) if added is not None else models.ItemTable.from_rows([])
+        removed = np.asarray(removed, dtype=np.int64)
+        sequence = placements.rows.copy()
+        positions = placements.pos.copy()
+
+        # 1. İlk etkilenen sıra pozisyonu
+        cut = len(sequence)
+        hit = np.flatnonzero(np.isin(sequence, removed))
+        if len(hit): cut = int(hit[0])
+        if added is not None and len(added):
+            # Eklenen en geç durak ve sonrası (LIFO'da daha önce yüklenen duraklar sabit)
+            later = np.flatnonzero(old.stop_order[sequence] <= added.stop_order.max())
+            if len(later): cut = min(cut, int(later[0]))
+
+        # 2. Silinenler çıkarılmış + eklenenler eklenmiş yeni tablo
+        keep = np.setdiff1d(np.arange(len(old)), removed)
+        new_row = np.full(len(old), -1, dtype=np.int64)
+        new_row[keep] = np.arange(len(keep))
+        tables = [old.take(keep)] + ([added] if added is not None else [])
+        items = models.ItemTable.concat(tables)
+
+        # 3. Sabit kalan önek yerleşimleri yeni tabloya aktarılır
+        self.container.placements = models.PlacementTable(items)
+        for row, pos in zip(sequence[:cut].tolist(), positions[:cut].tolist()):
+            self.container.placements.add(int(new_row[row]), pos, int(old.rotation[row]))
+
+        # 4. Kalan her şey strateji sırasıyla yeniden paketlenir
+        fixed = np.zeros(len(items), dtype=bool)
+        fixed[self.container.placements.rows] = True
+        order = self.loading_order(items, strategy)
+        self.pack(items, strategy, order=order[~fixed[order]])
+        return items
+
+    def calculate_axle_loads(self):
+        """Moment prensibiyle (M=F*d) ön ve arka dingil yükleri (Container.axle_loads)."""
+        return self.container.axle_loads()
+
+    def _axle_ok(self, weight, moment_y):
+        """Eklenen ağırlık/moment bir dingili sınırın üstüne çıkarıyor mu?
+
+        Sınırı zaten aşmış bir dingilin yükünü azaltan (artırmayan) yerleşimlere
+        izin verilir. moment_y dizi olabilir (toplu motor: her aday nokta için).
+        """
+        placements = self.container.placements
+        W, M = placements.total_weight, placements.moment[1]
+        front, rear = self.container.axle_split(W, M)
+        new_front, new_rear = self.container.axle_split(W + weight, M + moment_y)
+        front_limit, rear_limit = self._axle_limits
+        ok = True
+        if front_limit is not None:
+            ok = ok & ((new_front <= front_limit) | (new_front <= front + 1e-9))
+        if rear_limit is not None:
+            ok = ok & ((new_rear <= rear_limit) | (new_rear <= rear + 1e-9))
+        return ok
 
     def _can_place(self, pos, dims):
         # Sınır kontrolü
@@ -88,50 +448,38 @@ class Packer:
             pos[2] + dims[2] > self.container.dims[2]):
             return False
         
-        # Çarpışma kontrolü (AABB)
-        for p in self.container.placed_items:
-            p_pos = p.position
-            p_dims = p.get_dimension()
-            if (pos[0] < p_pos[0] + p_dims[0] and pos[0] + dims[0] > p_pos[0] and
-                pos[1] < p_pos[1] + p_dims[1] and pos[1] + dims[1] > p_pos[1] and
-                pos[2] < p_pos[2] + p_dims[2] and pos[2] + dims[2] > p_pos[2]):
-                return False
-        return True
+        # Çarpışma kontrolü (AABB, sadece komşu hücrelerdeki kutular)
+        return not self.index.collides(pos, dims)
 
     def _is_physically_valid(self, pos, dims, weight):
         """Stabilite ve Kırılganlık Kontrolü"""
         if pos[2] == 0: return True # Zemindeyse OK
-        
-        # 1. Kırılganlık Kontrolü (Altımdaki kutu kırılgan mı?)
-        # Altımdaki alanı tara
+        return self._support_code(pos, dims) == spatial.SUPPORT_OK
+
+    def _support_code(self, pos, dims):
+        """Tabanın hemen altındaki kutuları indeksten bulup temas alanını toplar (SUPPORT_* kodu)."""
+        z_bottom = pos[2]
         contact_area = 0
         total_base_area = dims[0] * dims[1]
         
-        # Kutunun alt tabanı
-        z_bottom = pos[2]
-        
-        for p in self.container.placed_items:
-            p_pos = p.position
-            p_dims = p.get_dimension()
+        # Tabanın çevresindeki ince dilimle kesişen kutular; pay, kayan nokta
+        # farkıyla 0.1cm sınırındaki kutuların dilim dışında kalmaması için
+        for b in self.index.query([pos[0], pos[1], z_bottom - 0.2], [dims[0], dims[1], 0.4]):
+            p_box = self.index.boxes[b]
             
-            # Eğer p kutusu, benim kutumun hemen altındaysa
-            if abs((p_pos[2] + p_dims[2]) - z_bottom) < 0.1:
+            # Eğer kutu, benim kutumun hemen altındaysa
+            if abs(p_box[5] - z_bottom) < 0.1:
                 # Kesişim alanını bul
-                x_overlap = max(0, min(pos[0]+dims[0], p_pos[0]+p_dims[0]) - max(pos[0], p_pos[0]))
-                y_overlap = max(0, min(pos[1]+dims[1], p_pos[1]+p_dims[1]) - max(pos[1], p_pos[1]))
+                x_overlap = max(0, min(pos[0]+dims[0], p_box[3]) - max(pos[0], p_box[0]))
+                y_overlap = max(0, min(pos[1]+dims[1], p_box[4]) - max(pos[1], p_box[1]))
                 area = x_overlap * y_overlap
                 
                 if area > 0:
-                    if p.fragile: return False # Kırılgan kutuya basamazsın!
+                    if self.container.placements.fragile[self.index.items[b]]: return spatial.SUPPORT_FRAGILE # Kırılgan kutuya basamazsın!
                     contact_area += area
         
         # 2. Stabilite Kontrolü (En az %60 temas gerekli)
         if (contact_area / total_base_area) < 0.60:
-            return False # Yeterli destek yok, devrilir
+            return spatial.SUPPORT_UNSTABLE # Yeterli destek yok, devrilir
             
-        return True
-
-    def _add_candidate(self, candidates, point):
-        if (point[0] < self.container.dims[0] and point[1] < self.container.dims[1] and point[2] < self.container.dims[2]):
-            if point not in candidates:
-                candidates.append(point)
\ No newline at end of file
+        return spatial.SUPPORT_OK
@@ -0,0 +1,92 @@
+"""Süre sınırlı (anytime) iyileştirme araması.
+
+Açgözlü planla başlar, yükleme sırasını yerel arama ile değiştirip yeniden
+paketler ve en iyi planı saklar. Süre (deadline) veya iterasyon bütçesi
+dolduğunda o ana kadarki en iyi plan döner. LIFO korunur: hamleler sadece
+aynı durağa ait birimler arasında yapılır.
+"""
+import time
+
+import numpy as np
+
+import algorithms
+import portfolio
+
+def _evaluate(items, container, order, packer_options, stop_at=None):
+    truck = container.empty_copy()
+    algorithms.Packer(truck, **packer_options).pack(items.copy(), order=order, stop_at=stop_at)
+    return truck, portfolio.score_plan(truck)
+
+def _neighbour(order, stops, placed, rng):
+    """Aynı durak içinde bir hamle: yerleşmeyen birimi öne al ya da iki birimi takas et."""
+    order = order.copy()
+    n = len(order)
+    unplaced = np.flatnonzero(~placed[order])
+    if len(unplaced) and rng.random() < 0.7:
+        i = int(rng.choice(unplaced))
+        seg_start = int(np.searchsorted(-stops[order], -stops[order[i]], side="left"))
+        if i > seg_start:
+            j = int(rng.integers(seg_start, i))
+            order[j:i + 1] = np.roll(order[j:i + 1], 1) # i'yi j'ye taşı
+            return order
+    i = int(rng.integers(n))
+    same_stop = np.flatnonzero(stops[order] == stops[order[i]])
+    j = int(rng.choice(same_stop))
+    order[i], order[j] = order[j], order[i]
+    return order
+
+def improve(items, container, deadline=5.0, max_iterations=None, strategy="balanced", seed=0, packer_options=None,
+            on_improve=None):
+    """Açgözlü planı `deadline` saniye (veya `max_iterations`) boyunca iyileştirir.
+
+    Dönen sözlük: container (en iyi plan), score, iterations ve history.
+    history, en iyi planın zaman içindeki gelişimidir:
+    (geçen süre sn, yerleşen adet, hacim doluluk oranı) listesi.
+    Girdi tablosu ve konteyner değiştirilmez. on_improve verilirse her yeni
+    en iyi planda history girdisiyle çağrılır (ara sonuç bildirimi).
+
+    Süre açgözlü planı da kapsar: çok büyük manifestlerde açgözlü paketleme
+    süre dolunca kesilir ve kısmi plan en iyi plan olarak döner.
+    """
+    start = time.monotonic()
+    stop_at = None if deadline is None else start + deadline
+    packer_options = packer_options or {}
+    rng = np.random.default_rng(seed)
+    stops = items.stop_order
+
+    def record(truck):
+        fill_rate = float(truck.placements.volume.sum()) / truck.total_volume
+        history.append((time.monotonic() - start, len(truck.placements), fill_rate))
+        if on_improve is not None:
+            on_improve(history[-1])
+
+    order = algorithms.Packer(container.empty_copy()).loading_order(items, strategy)
+    best, best_score = _evaluate(items, container, order, packer_options, stop_at)
+    current, current_score = order, best_score
+    history = []
+    record(best)
+
+    placed = np.zeros(len(items), dtype=bool)
+    placed[best.placements.rows] = True
+    iterations = 0
+    elapsed_per_iter = time.monotonic() - start
+    while len(items) > 1 and (max_iterations is None or iterations < max_iterations):
+        # Bir sonraki iterasyon süreyi aşacaksa başlama (en iyi plan her an hazır)
+        if deadline is not None and time.monotonic() - start + elapsed_per_iter > deadline:
+            break
+        t0 = time.monotonic()
+        candidate = _neighbour(current, stops, placed, rng)
+        # Tahmin yanılsa da değerlendirme süreyi aşmaz (kesilen plan daha düşük puan alır)
+        truck, score = _evaluate(items, container, candidate, packer_options, stop_at)
+        iterations += 1
+        if score >= current_score:
+            # Eşit puanlı hamleler de kabul edilir (platolarda gezinmek için)
+            current, current_score = candidate, score
+            placed[:] = False
+            placed[truck.placements.rows] = True
+        if score > best_score:
+            best, best_score = truck, score
+            record(best)
+        elapsed_per_iter = max(elapsed_per_iter * 0.8, time.monotonic() - t0)
+
+    return {"container": best, "score": best_score, "iterations": iterations, "history": history}
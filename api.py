@@ -0,0 +1,188 @@
+"""Streamlit'ten bağımsız paketleme arayüzü.
+
+Manifest dosyasını okur, planı çözer ve JSON/PDF olarak yazar. Sadece
+NumPy ve paketleme modüllerini yükler; pandas (CSV/Excel), fpdf (PDF) gibi
+ağır bağımlılıklar yalnızca gerektiğinde içe aktarılır.
+"""
+import json
+import os
+
+import algorithms
+import anytime
+import cache
+import fleet
+import instrumentation
+import models
+import portfolio
+import zones
+
+# Komut satırı strateji adları -> Packer strateji adları
+STRATEGY_NAMES = {"balanced": "balanced", "density": "Density"}
+
+def packer_strategy(strategy):
+    """Strateji adı ya da uygulama etiketi ("Density (Heavy Bottom)") -> Packer strateji adı.
+
+    Etiketler portfolio/anytime gibi önekle eşlenir; tanınmayan adlar aynen döner.
+    """
+    kind = strategy.lower()
+    for name, packer_name in STRATEGY_NAMES.items():
+        if kind.startswith(name):
+            return packer_name
+    return strategy
+
+def load_manifest(path):
+    """Manifest dosyasını okur; ingest.ingest ile aynı sözlüğü döndürür.
+
+    JSON dosyası uygulamanın satır biçimini (w, l, h, kg, qty, dest, stop, ...)
+    kullanır; CSV, Excel ve Parquet dosyaları indirilebilir şablonun sütunlarını.
+    """
+    if os.path.splitext(path)[1].lower() == ".json":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        rows = data["rows"] if isinstance(data, dict) else data
+        return {"rows": rows, "errors": [], "skipped": 0, "read": len(rows)}
+    # pandas sadece tablo biçimleri için yüklenir
+    import ingest
+    return ingest.ingest(path)
+
+def resolve_vehicles(vehicles, axle_limits=None):
+    """Hazır araç adlarını (ör. "Van") boş Container nesnelerine çevirir.
+
+    axle_limits verilirse (ön, arka) dingil sınırları (kg, None = sınırsız)
+    tüm araçlara uygulanır.
+    """
+    vehicles = [models.Container.from_preset(v) if isinstance(v, str) else v for v in vehicles]
+    if not vehicles:
+        raise ValueError("At least one vehicle is required")
+    if axle_limits is not None:
+        front, rear = axle_limits
+        for v in vehicles:
+            v.axle_front_limit, v.axle_rear_limit = front, rear
+    return vehicles
+
+def plan_key(rows, vehicles, strategy="balanced", blocks=False, fleet_mode=None, segmented=False):
+    """solve'un önbellek anahtarı (vehicles resolve_vehicles ile çözülmüş olmalı)."""
+    if fleet_mode is None:
+        fleet_mode = len(vehicles) > 1
+    options = {"blocks": blocks, "fleet": fleet_mode}
+    if segmented:
+        options["segmented"] = True # Önceki anahtarlar değişmesin diye sadece açıkken
+    return cache.fingerprint(rows, vehicles, strategy, options)
+
+def solve(rows, vehicles, strategy="balanced", blocks=False, fleet_mode=None, deadline=5.0, plan_cache=None,
+          progress=None, axle_limits=None, segmented=False):
+    """Manifest satırlarını araç(lar)a paketler.
+
+    strategy: balanced, density, portfolio, anytime (uygulamadaki etiketler de
+    kabul edilir). Birden fazla araç verilirse (veya fleet_mode) filo
+    paketlemesi yapılır. Dönen sözlük: items, truck (ilk/tek araç), fleet
+    (araç listesi ya da None) ve history (anytime gelişimi ya da None).
+
+    progress verilirse ara durumla çağrılır: tek araçlı paketlemede
+    {"placed", "total"}, anytime aramasında her yeni en iyi planda
+    {"placed", "total", "history"}. Filo ve portföy ayrı süreçlerde
+    çalıştığı için ara bildirim yapmaz. axle_limits: (ön, arka) dingil yük
+    sınırları (kg); aşan yerleşimler yapılmaz. segmented: tek araçlı
+    balanced/density paketlemede durak bölgeleri paralel paketlenir (zones).
+    """
+    vehicles = resolve_vehicles(vehicles, axle_limits)
+    if fleet_mode is None:
+        fleet_mode = len(vehicles) > 1
+    key = None
+    if plan_cache is not None:
+        key = plan_key(rows, vehicles, strategy, blocks, fleet_mode, segmented)
+        plan = plan_cache.get(key)
+        if plan is not None:
+            return plan
+
+    items = models.ItemTable.from_rows(rows)
+    options = {"blocks": blocks}
+    plan = {"items": items, "fleet": None, "history": None}
+    truck = vehicles[0]
+    kind = strategy.lower()
+    if fleet_mode:
+        # Her araç ayrı süreçte paketlenir, kalanlar boş araçlara dağıtılır
+        plan["fleet"] = fleet.pack_fleet(items, vehicles, packer_strategy(strategy), packer_options=options)["vehicles"]
+        truck = plan["fleet"][0]
+    elif kind.startswith("portfolio"):
+        # Tüm stratejiler paralel çalışır, en iyi plan seçilir
+        truck, _ = portfolio.solve(items, truck, packer_options=options)
+    elif kind.startswith("anytime"):
+        # Açgözlü plandan başlayıp `deadline` saniye boyunca iyileştir
+        on_improve = None
+        if progress is not None:
+            history = []
+            def on_improve(entry):
+                history.append(entry)
+                progress({"placed": entry[1], "total": len(items), "history": list(history)})
+        result = anytime.improve(items, truck, deadline=deadline, packer_options=options, on_improve=on_improve)
+        truck = result["container"]
+        plan["history"] = result["history"]
+    elif segmented:
+        # Durak bölgeleri ayrı süreçlerde paketlenir, sonra birleştirilir
+        zones.pack_zones(items, truck, packer_strategy(strategy), packer_options=options)
+    else:
+        packer = algorithms.Packer(truck, **options)
+        if progress is not None:
+            # Yaklaşık %1 adımlarla bildirim
+            instrumentation.track_progress(packer, lambda placed: progress({"placed": placed, "total": len(items)}),
+                                           every=max(1, len(items) // 100))
+        packer.pack(items, packer_strategy(strategy))
+    plan["truck"] = truck
+    if plan_cache is not None:
+        plan_cache.put(key, plan)
+    return plan
+
+def summarize(truck):
+    """Tek araç planının özet metrikleri."""
+    placements = truck.placements
+    front, rear = truck.axle_loads()
+    cog = placements.cog
+    used = float(placements.volume.sum())
+    return {
+        "vehicle": truck.vehicle_type,
+        "dims": list(truck.dims),
+        "max_weight": truck.max_weight,
+        "placed": len(placements),
+        "volume_m3": round(used / 1000000, 3),
+        "fill_rate": round(used / truck.total_volume, 4),
+        "weight_kg": float(placements.weight.sum()),
+        "axle_front_kg": round(front, 1),
+        "axle_rear_kg": round(rear, 1),
+        "cog_cm": [round(c, 1) for c in cog] if cog else None,
+    }
+
+def plan_to_dict(plan):
+    """Planı JSON'a yazılabilir sözlüğe çevirir (yerleşimler yükleme sırasıyla)."""
+    vehicles = []
+    for truck in plan["fleet"] or [plan["truck"]]:
+        placements = truck.placements
+        items, rows = placements.items, placements.rows
+        boxes = []
+        for n in range(len(placements)):
+            row = int(rows[n])
+            boxes.append({
+                "row": row,
+                "destination": items.destinations[items.dest_codes[row]],
+                "stop": int(items.stop_order[row]),
+                "position": [models._py(v) for v in placements.pos[n]],
+                "dims": [models._py(v) for v in placements.dims[n]],
+                "rotated": bool(items.rotation[row] == 1),
+                "weight": models._py(items.weight[row]),
+                "fragile": bool(items.fragile[row]),
+            })
+        vehicles.append({"summary": summarize(truck), "placements": boxes})
+    placed = sum(v["summary"]["placed"] for v in vehicles)
+    return {"total_units": len(plan["items"]), "placed": placed,
+            "unplaced": len(plan["items"]) - placed, "vehicles": vehicles}
+
+def write_plan(plan, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(plan_to_dict(plan), f, separators=(",", ":"))
+
+def write_pdf(plan, path):
+    """İlk/tek aracın PDF raporunu yazar (fpdf burada yüklenir)."""
+    import report
+    truck = plan["truck"]
+    axle = truck.axle_loads()
+    report.write_pdf(path, truck, plan["items"], axle)
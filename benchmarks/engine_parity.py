@@ -0,0 +1,60 @@
+"""Yerleşim motorlarının eşdeğerlik testi (scalar vs batch).
+
+Kullanım (repo kökünden):
+    python -m benchmarks.engine_parity
+    python -m benchmarks.engine_parity --seeds 50 --scenarios many_sku --vehicles Van
+
+Sentetik manifestlerin ölçüleri tam santimetre olmayan (bir ondalıklı)
+değerlere kaydırılır; her manifest skaler ve toplu motorla paketlenir.
+İki plan (yerleşim sırası, konum, rotasyon) birebir aynı olmalıdır.
+"""
+import argparse
+import random
+import time
+
+import algorithms
+import models
+from benchmarks import manifests
+
+ENGINES = ("scalar", "batch")
+
+def fractional(rows, vehicle, seed=0):
+    """Satır ölçülerini ±%5 oynatıp bir ondalığa yuvarlar (araç ölçülerini aşmadan)."""
+    rng = random.Random(seed)
+    dims, _ = models.VEHICLE_PRESETS[vehicle]
+    return [dict(row, **{k: min(round(row[k] * rng.uniform(0.95, 1.05), 1), d) for k, d in zip("wlh", dims)})
+            for row in rows]
+
+def plan(engine, rows, vehicle, strategy):
+    truck = models.Container.from_preset(vehicle)
+    algorithms.Packer(truck, engine=engine).pack(models.ItemTable.from_rows(rows), strategy)
+    p = truck.placements
+    return p.rows.tolist(), p.pos.tolist(), p.items.rotation[p.rows].tolist()
+
+def run(scenarios, vehicles, strategies, seeds):
+    print(f"{'scenario':<14} {'vehicle':<25} {'strategy':<9} {'seed':>4} {'placed':>7} "
+          + " ".join(f"{e + ' s':>11}" for e in ENGINES))
+    for scenario in scenarios:
+        for vehicle in vehicles:
+            for seed in range(seeds):
+                rows = fractional(manifests.generate(scenario, vehicle, seed), vehicle, seed)
+                for strategy in strategies:
+                    plans, timings = {}, {}
+                    for engine in ENGINES:
+                        t0 = time.perf_counter()
+                        plans[engine] = plan(engine, rows, vehicle, strategy)
+                        timings[engine] = time.perf_counter() - t0
+                    if plans["batch"] != plans["scalar"]:
+                        raise SystemExit(f"Mismatch: batch vs scalar at "
+                                         f"{scenario} / {vehicle} / {strategy} / seed {seed}")
+                    print(f"{scenario:<14} {vehicle:<25} {strategy:<9} {seed:>4} {len(plans['scalar'][0]):>7} "
+                          + " ".join(f"{timings[e]:>11.3f}" for e in ENGINES), flush=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", default=list(manifests.SCENARIOS), choices=list(manifests.SCENARIOS))
+    parser.add_argument("--vehicles", nargs="+", default=["Van"], choices=list(models.VEHICLE_PRESETS))
+    parser.add_argument("--strategies", nargs="+", default=["balanced", "Density"], choices=["balanced", "Density"])
+    parser.add_argument("--seeds", type=int, default=5)
+    args = parser.parse_args()
+    run(args.scenarios, args.vehicles, args.strategies, args.seeds)
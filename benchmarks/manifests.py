@@ -0,0 +1,60 @@
+"""Tekrarlanabilir sentetik manifest üreteçleri.
+
+Her senaryo, uygulamanın satır biçiminde (w, l, h, kg, qty, dest, stop, c,
+fragile, rotate) bir manifest üretir. Aynı (senaryo, araç, seed) her zaman
+aynı manifesti verir. Toplam birim hacmi aracın hacminin `load_factor`
+katıdır; böylece paketleyici her senaryoda sığmayan yükle de sınanır.
+"""
+import random
+
+import models
+
+def _box(rng, sizes, vehicle_dims):
+    """`sizes` (min, max cm) aralığında, araca sığan rastgele koli (5 cm katları)."""
+    return tuple(min(int(rng.uniform(*sizes)) // 5 * 5, d) for d in vehicle_dims)
+
+def _rows(rng, vehicle, n_skus, qty_range, sizes=(20, 80), fragile_share=0.1, stops=(2,), load_factor=1.1):
+    dims, _ = models.VEHICLE_PRESETS[vehicle]
+    target = dims[0] * dims[1] * dims[2] * load_factor
+    skus = []
+    for _ in range(n_skus):
+        w, l, h = _box(rng, sizes, dims)
+        stop = rng.choice(stops)
+        skus.append({
+            "w": w, "l": l, "h": h,
+            "kg": max(1, int(w * l * h / 1000000 * rng.uniform(80, 400))), # 80-400 kg/m3
+            "dest": models.DESTINATIONS[stop], "stop": stop,
+            "c": models.STOP_COLORS[stop % len(models.STOP_COLORS)],
+            "fragile": rng.random() < fragile_share, "rotate": rng.random() < 0.8,
+        })
+    # Hedef hacme ulaşana kadar SKU'lar sırayla adet alır
+    rows, volume = [], 0.0
+    while volume < target:
+        for sku in skus:
+            if volume >= target: break
+            qty = rng.randint(*qty_range)
+            rows.append(dict(sku, qty=qty))
+            volume += qty * sku["w"] * sku["l"] * sku["h"]
+    return rows
+
+SCENARIOS = {
+    # Az çeşit, yüksek adet (toptan sevkiyat)
+    "few_sku": lambda rng, vehicle: _rows(rng, vehicle, n_skus=4, qty_range=(20, 80), sizes=(30, 80)),
+    # Çok çeşit, düşük adet (e-ticaret toplama)
+    "many_sku": lambda rng, vehicle: _rows(rng, vehicle, n_skus=300, qty_range=(1, 3), sizes=(15, 60)),
+    # Kolilerin yarısı kırılabilir
+    "fragile_heavy": lambda rng, vehicle: _rows(rng, vehicle, n_skus=30, qty_range=(2, 10), fragile_share=0.5),
+    # Rotadaki tüm teslimat durakları
+    "multi_stop": lambda rng, vehicle: _rows(rng, vehicle, n_skus=40, qty_range=(2, 10),
+                                             stops=tuple(range(1, len(models.DESTINATIONS)))),
+}
+
+def generate(scenario, vehicle, seed=0):
+    """(senaryo, araç ön ayarı, seed) için manifest satırlarını döndürür."""
+    if scenario not in SCENARIOS:
+        raise ValueError(f"Unknown scenario: {scenario}")
+    if vehicle not in models.VEHICLE_PRESETS:
+        raise ValueError(f"Unknown vehicle preset: {vehicle}")
+    # Senaryo ve araç adı seed'e katılır: her kombinasyon bağımsız ama sabit
+    rng = random.Random(f"{scenario}|{vehicle}|{seed}")
+    return SCENARIOS[scenario](rng, vehicle)
@@ -0,0 +1,124 @@
+"""Paketleme performans paketi.
+
+Kullanım (repo kökünden):
+    python -m benchmarks.packing_suite --output sonuc.json
+    python -m benchmarks.packing_suite --vehicles Van --scenarios few_sku --compare onceki.json
+
+Her (senaryo, araç, strateji) için sentetik manifest paketlenir; süre
+(tekrarların en iyisi), tepe bellek (tracemalloc, ayrı bir çalıştırmada),
+yerleşen adet ve hacim doluluğu raporlanır; --profile ile faz süreleri ve
+ret sayaçları da eklenir. --compare verilirse önceki sonuç dosyasına göre
+yavaşlayan veya daha az yerleştiren durumlar listelenir ve çıkış kodu 1 olur.
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import algorithms
+import instrumentation
+import models
+from benchmarks import manifests
+
+STRATEGIES = ["balanced", "Density"]
+
+def pack_once(rows, vehicle, strategy, packer_options):
+    truck = models.Container.from_preset(vehicle)
+    items = models.ItemTable.from_rows(rows)
+    algorithms.Packer(truck, **packer_options).pack(items, strategy)
+    return truck, items
+
+def measure(rows, vehicle, strategy, packer_options, repeat=1, profile=False):
+    seconds = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        truck, items = pack_once(rows, vehicle, strategy, packer_options)
+        seconds.append(time.perf_counter() - t0)
+    # Bellek ölçümü süreyi bozmasın diye ayrı çalıştırılır
+    tracemalloc.start()
+    pack_once(rows, vehicle, strategy, packer_options)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    result = {
+        "units": len(items),
+        "placed": len(truck.placements),
+        "utilization": round(float(truck.placements.volume.sum()) / truck.total_volume, 4),
+        "seconds": round(min(seconds), 4),
+        "peak_mb": round(peak / 2**20, 2),
+    }
+    if profile:
+        # Faz süreleri ve ret sayaçları (ölçüm yükü yüzünden ayrı bir çalıştırma)
+        stats = instrumentation.PackStats()
+        pack_once(rows, vehicle, strategy, dict(packer_options, stats=stats))
+        result["stats"] = stats.summary()
+    return result
+
+def run(scenarios, vehicles, strategies, seed=0, repeat=1, packer_options=None, profile=False):
+    packer_options = packer_options or {}
+    results = []
+    print(f"{'scenario':<14} {'vehicle':<25} {'strategy':<9} {'placed':>11} {'util':>6} {'sec':>8} {'MB':>7}")
+    for scenario in scenarios:
+        for vehicle in vehicles:
+            rows = manifests.generate(scenario, vehicle, seed)
+            for strategy in strategies:
+                r = {"scenario": scenario, "vehicle": vehicle, "strategy": strategy, "seed": seed,
+                     **measure(rows, vehicle, strategy, packer_options, repeat, profile)}
+                results.append(r)
+                print(f"{scenario:<14} {vehicle:<25} {strategy:<9} {r['placed']:>5}/{r['units']:<5} "
+                      f"{r['utilization']:>6.1%} {r['seconds']:>8.3f} {r['peak_mb']:>7.1f}", flush=True)
+    return {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.machine(), "packer_options": packer_options, "repeat": repeat,
+        },
+        "results": results,
+    }
+
+def compare(current, baseline, tolerance=0.2):
+    """Önceki sonuca göre gerilemeleri (yavaşlama > tolerance, daha az yerleşim) döndürür."""
+    def key(r):
+        return r["scenario"], r["vehicle"], r["strategy"], r["seed"]
+    previous = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        old = previous.get(key(r))
+        if old is None: continue
+        if r["seconds"] > old["seconds"] * (1 + tolerance):
+            regressions.append(f"{' / '.join(map(str, key(r)))}: {old['seconds']:.3f}s -> {r['seconds']:.3f}s")
+        if r["placed"] < old["placed"]:
+            regressions.append(f"{' / '.join(map(str, key(r)))}: placed {old['placed']} -> {r['placed']}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", default=list(manifests.SCENARIOS), choices=list(manifests.SCENARIOS))
+    parser.add_argument("--vehicles", nargs="+", default=list(models.VEHICLE_PRESETS), choices=list(models.VEHICLE_PRESETS))
+    parser.add_argument("--strategies", nargs="+", default=STRATEGIES, choices=STRATEGIES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per case (best is reported)")
+    parser.add_argument("--blocks", action="store_true", help="pack with block stacking enabled")
+    parser.add_argument("--profile", action="store_true", help="add per-phase timings and rejection counts to the results")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--compare", help="previous results JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown ratio for --compare")
+    args = parser.parse_args()
+
+    report = run(args.scenarios, args.vehicles, args.strategies, args.seed, args.repeat, {"blocks": args.blocks}, args.profile)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("packer_options") != report["meta"]["packer_options"]:
+            print("WARNING: baseline was run with different packer options", baseline["meta"].get("packer_options"))
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,67 @@
+"""Uzamsal indeks ölçekleme testi (grid vs brute force).
+
+Kullanım (repo kökünden):
+    python -m benchmarks.spatial_scaling
+    python -m benchmarks.spatial_scaling --sizes 100 1000 10000 --queries 2000
+
+Her boyut için 13.6m dorse içine N adet çakışmayan kutu dizilir, rastgele
+sorgular iki indekse de sorulur ve cevapların birebir aynı olduğu doğrulanır.
+"""
+import argparse
+import random
+import time
+
+import spatial
+
+TRAILER = [240, 1360, 270]
+
+def lattice_boxes(n, dims=TRAILER, seed=0):
+    """Konteyneri n kutu alacak şekilde böler, hafif boşluklu kutular döndürür."""
+    rng = random.Random(seed)
+    side = (dims[0] * dims[1] * dims[2] / n) ** (1 / 3)
+    counts = [max(1, int(d // side)) for d in dims]
+    while counts[0] * counts[1] * counts[2] < n:
+        counts[counts.index(min(counts))] += 1
+    step = [d / c for d, c in zip(dims, counts)]
+    boxes = []
+    for k in range(counts[2]):
+        for j in range(counts[1]):
+            for i in range(counts[0]):
+                if len(boxes) == n: return boxes
+                size = [s * rng.uniform(0.6, 1.0) for s in step]
+                boxes.append(([i * step[0], j * step[1], k * step[2]], size))
+    return boxes
+
+def random_queries(m, dims=TRAILER, seed=1):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(m):
+        size = [rng.uniform(10, 120), rng.uniform(10, 120), rng.uniform(10, 100)]
+        pos = [rng.uniform(0, d - s) for d, s in zip(dims, size)]
+        queries.append((pos, size))
+    return queries
+
+def run(sizes, n_queries):
+    queries = random_queries(n_queries)
+    print(f"{'items':>8} {'brute us/q':>12} {'grid us/q':>12} {'speedup':>8}")
+    for n in sizes:
+        boxes = lattice_boxes(n)
+        results = {}
+        timings = {}
+        for kind in ("brute", "grid"):
+            index = spatial.make_index(kind, TRAILER)
+            for pos, size in boxes:
+                index.insert(pos, size)
+            t0 = time.perf_counter()
+            results[kind] = [index.collides(pos, size) for pos, size in queries]
+            timings[kind] = (time.perf_counter() - t0) / n_queries * 1e6
+        if results["brute"] != results["grid"]:
+            raise SystemExit(f"Mismatch between grid and brute force at n={n}")
+        print(f"{n:>8} {timings['brute']:>12.1f} {timings['grid']:>12.1f} {timings['brute'] / timings['grid']:>7.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 1000, 3000, 10000])
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.sizes, args.queries)
@@ -0,0 +1,130 @@
+"""Plan sonuç önbelleği.
+
+Paketleme sonuçları, manifest satırları + araç(lar) + strateji + motor
+sürümünün kanonik özetiyle (sha256) saklanır. Bellekte LRU, isteğe bağlı
+olarak diskte (uygulama yeniden başlasa da kalan) ikinci bir katman tutulur.
+Disk katmanı planları ikili plan dosyası (.tlp) olarak yazar.
+"""
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import planfile
+
+# Paketleme davranışı değişince artırılır; eski planlar otomatik geçersiz olur
+ENGINE_VERSION = 1
+
+def _canonical(value):
+    """Özet için tip bağımsız değer: 80, 80.0 ve np.int64(80) aynı sonucu verir."""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_canonical(v) for v in value]
+    return value
+
+def _axle_limits(vehicle):
+    # Sınır tanımlı değilse anahtara girmez (önceki anahtarlar geçerli kalır)
+    if vehicle.axle_front_limit is None and vehicle.axle_rear_limit is None:
+        return []
+    return [vehicle.axle_front_pos, vehicle.axle_rear_pos, vehicle.axle_front_limit, vehicle.axle_rear_limit]
+
+def fingerprint(rows, vehicles, strategy, options=None):
+    """Manifest satırları, araçlar (ölçü + tonaj) ve stratejiden plan anahtarı üretir.
+
+    Satır sırası anahtara dahildir (eşitlik bozmada yükleme sırasını etkiler).
+    """
+    payload = {
+        "engine": ENGINE_VERSION,
+        "rows": _canonical(list(rows)),
+        "vehicles": [_canonical(list(v.dims) + [v.max_weight] + _axle_limits(v)) for v in vehicles],
+        "strategy": strategy,
+        "options": _canonical(options or {}),
+    }
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class PlanCache:
+    """LRU bellek katmanı + isteğe bağlı disk katmanı.
+
+    Değerler api.solve plan sözlükleridir (items, truck, fleet, history).
+    Bellekte serileştirilmiş tutulur; her get yeni bir kopya döndürür, böylece
+    çağıranın planı değiştirmesi (ör. repack) önbelleği bozmaz. Diskten açılan
+    planlar bellek eşlemeli (copy-on-write) olduğu için dosya da değişmez.
+    Oturumlar ve iş servisi aynı önbelleği paylaştığı için bellek katmanı ve
+    disk yazımları bir kilitle korunur.
+    """
+    def __init__(self, max_entries=32, directory=None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.directory = directory
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".tlp")
+
+    def _remember(self, key, blob):
+        # Çağıran kilidi tutar
+        self._memory[key] = blob
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False) # En uzun süredir kullanılmayan
+
+    def get(self, key):
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+        if blob is not None:
+            return pickle.loads(blob)
+        if self.directory and os.path.exists(self._path(key)):
+            plan = planfile.load_plan(self._path(key))
+            blob = pickle.dumps(plan, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                self._remember(key, blob)
+                self.hits += 1
+            return plan
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, blob)
+            if self.directory:
+                # Yarım yazılmış dosya okunmasın diye önce geçici dosyaya yazılır
+                tmp = self._path(key) + ".tmp"
+                planfile.save_plan(tmp, value)
+                os.replace(tmp, self._path(key))
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._memory:
+                return True
+        return bool(self.directory and os.path.exists(self._path(key)))
+
+    def __len__(self):
+        return len(self._memory)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self.directory:
+                for name in os.listdir(self.directory):
+                    if name.endswith(".tlp"):
+                        os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,79 @@
+"""tetralog komut satırı: manifest dosyalarını arayüzsüz paketler.
+
+Örnek:
+    python cli.py gunluk/*.csv --vehicle "Truck (8m)" --blocks --out-dir planlar --pdf
+
+Her manifest için <ad>.plan.json (ve istenirse <ad>.tlp, <ad>.pdf) yazılır; hatalı
+dosyalar atlanır ve çıkış kodu 1 olur. --validate ile her plan bağımsız doğrulayıcıdan
+geçirilir; kural ihlali olan planlar da hata sayılır.
+"""
+import argparse
+import os
+import sys
+import time
+
+import api
+import cache
+import models
+import planfile
+import validation
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="tetralog", description="Pack truck-loading manifests without the web UI.")
+    parser.add_argument("manifests", nargs="+", help="manifest files (.json, .csv, .xlsx, .parquet)")
+    parser.add_argument("--vehicle", action="append", choices=list(models.VEHICLE_PRESETS),
+                        help="vehicle preset; repeat for a fleet (default: Standard Trailer (13.6m))")
+    parser.add_argument("--strategy", default="balanced", choices=["balanced", "density", "portfolio", "anytime"])
+    parser.add_argument("--deadline", type=float, default=5.0, help="seconds for the anytime strategy")
+    parser.add_argument("--blocks", action="store_true", help="stack identical SKUs as blocks")
+    parser.add_argument("--zones", action="store_true",
+                        help="pack each stop's zone of the vehicle in parallel, then stitch (balanced/density only)")
+    parser.add_argument("--axle-limits", nargs=2, type=float, metavar=("FRONT", "REAR"),
+                        help="reject placements that push the front/rear axle load over these kg limits")
+    parser.add_argument("--out-dir", default=".", help="directory for plan files")
+    parser.add_argument("--pdf", action="store_true", help="also write a PDF load report")
+    parser.add_argument("--binary", action="store_true", help="also write the plan as a binary .tlp file")
+    parser.add_argument("--validate", action="store_true", help="check each plan independently; violations count as failures")
+    parser.add_argument("--cache-dir", help="reuse plans of identical manifests across runs")
+    parser.add_argument("--quiet", action="store_true")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    vehicles = args.vehicle or ["Standard Trailer (13.6m)"]
+    plan_cache = cache.PlanCache(directory=args.cache_dir) if args.cache_dir else None
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    failed = 0
+    for path in args.manifests:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        start = time.perf_counter()
+        try:
+            manifest = api.load_manifest(path)
+            for line, message in manifest["errors"]:
+                print(f"{path}:{line}: skipped: {message}", file=sys.stderr)
+            plan = api.solve(manifest["rows"], vehicles, args.strategy, blocks=args.blocks,
+                             deadline=args.deadline, plan_cache=plan_cache, axle_limits=args.axle_limits,
+                             segmented=args.zones)
+            api.write_plan(plan, os.path.join(args.out_dir, stem + ".plan.json"))
+            if args.binary:
+                planfile.save_plan(os.path.join(args.out_dir, stem + ".tlp"), plan)
+            if args.pdf:
+                api.write_pdf(plan, os.path.join(args.out_dir, stem + ".pdf"))
+        except (OSError, ValueError, KeyError, ImportError) as exc:
+            failed += 1
+            print(f"{path}: error: {exc}", file=sys.stderr)
+            continue
+        if args.validate:
+            for n, truck in enumerate(plan["fleet"] or [plan["truck"]], 1):
+                report = validation.validate(truck)
+                if not report["ok"]:
+                    failed += 1
+                    print(f"{path}: vehicle #{n}: invalid plan: {validation.summary(report)}", file=sys.stderr)
+        if not args.quiet:
+            placed = sum(len(t.placements) for t in plan["fleet"] or [plan["truck"]])
+            print(f"{path}: {placed}/{len(plan['items'])} placed in {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Çoklu araç (filo) paketleme.
+
+Manifest, karışık tipteki araçlara hacim ve tonaj bütçesine göre bölünür;
+her araç ayrı bir süreçte paketlenir, ardından sığmayan birimler boş yeri
+kalan araçlara sırayla dağıtılır. Dağıtılan birimler sadece mevcut yükün
+önüne (kapı tarafı) konur ve doğrulama yeni bir ihlal bulursa ekleme geri
+alınır; böylece boşaltma sırası bozulmaz.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import algorithms
+import models
+import validation
+
+# Bölüştürmede aracın hacminin bu oranı kadar yük atanır (kalanı paketleme kaybı)
+FILL_TARGET = 0.80
+
+def split_manifest(items, vehicles, strategy="balanced"):
+    """Yükleme sırasına göre birimleri araçlara böler; her araç için satır dizisi döndürür.
+
+    Durak sırası korunur: birimler LIFO sırasıyla dolaşılır, böylece her araç
+    ardışık duraklardan oluşan bir dilim alır. Son araç, hacmini ve tonajını
+    aşmayan kadarını alır; kalan birimler hiçbir dilime girmez.
+    """
+    order = algorithms.Packer(vehicles[0].empty_copy()).loading_order(items, strategy)
+    cum_volume = np.cumsum(items.volume[order])
+    cum_weight = np.cumsum(items.weight[order])
+    parts, start = [], 0
+    for v, vehicle in enumerate(vehicles):
+        base_volume = cum_volume[start - 1] if start else 0
+        base_weight = cum_weight[start - 1] if start else 0
+        # Son araçtan sonra yük alacak araç yok: hedef yerine hacmin tamamı
+        fill = 1.0 if v == len(vehicles) - 1 else FILL_TARGET
+        by_volume = np.searchsorted(cum_volume, base_volume + vehicle.total_volume * fill, side="right")
+        by_weight = np.searchsorted(cum_weight, base_weight + vehicle.max_weight, side="right")
+        end = max(start, min(by_volume, by_weight))
+        parts.append(order[start:end])
+        start = end
+    return parts
+
+def pack_vehicle(items, container, strategy="balanced", packer_options=None):
+    """Tek aracı paketler; (konteyner, yerleşmeyen satırlar) döndürür."""
+    truck = container.empty_copy()
+    algorithms.Packer(truck, **(packer_options or {})).pack(items, strategy)
+    unplaced = np.setdiff1d(np.arange(len(items)), truck.placements.rows)
+    return truck, unplaced
+
+def pack_fleet(items, vehicles, strategy="balanced", max_workers=None, packer_options=None):
+    """Manifesti araç listesine paketler.
+
+    Dönen sözlük: vehicles (yüklü konteynerler, girdi sırasıyla) ve
+    unplaced (hiçbir araca sığmayan birimlerin ItemTable'ı). Girdi tablosu
+    ve araçlar değiştirilmez; her araç kendi alt tablosunu taşır.
+    """
+    split = split_manifest(items, vehicles, strategy)
+    parts = [items.take(rows) for rows in split]
+    # Hiçbir araca bölüştürülemeyenler doğrudan dengelemeye kalır
+    overflow = np.setdiff1d(np.arange(len(items)), np.concatenate(split))
+    if max_workers == 1:
+        results = [pack_vehicle(part, v, strategy, packer_options) for part, v in zip(parts, vehicles)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(pack_vehicle, part, v, strategy, packer_options) for part, v in zip(parts, vehicles)]
+            results = [f.result() for f in futures]
+
+    trucks = [truck for truck, _ in results]
+    leftovers = [part.take(unplaced) for part, (_, unplaced) in zip(parts, results) if len(unplaced)]
+    if len(overflow):
+        leftovers.append(items.take(overflow))
+    leftover = models.ItemTable.concat(leftovers) if leftovers else None
+
+    # Dengeleme: kalanlar, en çok boş hacmi olan araçtan başlayarak sırayla denenir
+    spare = [t.total_volume - float(t.placements.volume.sum()) for t in trucks]
+    for v in sorted(range(len(trucks)), key=lambda v: -spare[v]):
+        if leftover is None or not len(leftover): break
+        leftover = _fill_remaining(trucks[v], leftover, strategy, packer_options)
+
+    if leftover is None:
+        leftover = items.take([])
+    return {"vehicles": trucks, "unplaced": leftover}
+
+def _fill_remaining(truck, extra, strategy, packer_options):
+    """Aracın mevcut yükünün önüne (kapı tarafı) `extra` birimlerini ekler, sığmayanları döndürür.
+
+    Sadece araçtaki en erken duraktan daha geç teslim edilmeyecek birimler
+    denenir (önde kalıp arkadakileri engellemesinler). Birimler kalan boyda
+    ayrı paketlenip mevcut yükün önüne taşınır; doğrulama yeni bir ihlal
+    bulursa araç eski haline döner.
+    """
+    old = truck.placements
+    W, L, H = truck.dims
+    extent = float((old.pos[:, 1] + old.dims[:, 1]).max()) if len(old) else 0.0
+    candidates = np.arange(len(extra))
+    if len(old):
+        candidates = np.flatnonzero(extra.stop_order <= old.items.stop_order[old.rows].min())
+    if not len(candidates) or L - extent <= 0:
+        return extra
+
+    budget = None
+    if truck.max_weight is not None:
+        budget = truck.max_weight - old.total_weight
+        if budget <= 0: return extra
+    front = models.Container(W, L - extent, H, budget)
+    front.vehicle_type = truck.vehicle_type
+    part = extra.take(candidates)
+    front, _ = pack_vehicle(part, front, strategy, packer_options)
+    if not len(front.placements):
+        return extra
+
+    before = validation.validate(truck)
+    base = old.items if old.items is not None else extra.take([])
+    combined = models.ItemTable.concat([base, extra])
+    # Eski yerleşim korunur; yenisi kopya diziler üzerinde kurulur
+    truck.placements = models.PlacementTable.from_arrays(combined, old.rows.copy(), old.pos.copy(),
+                                                         old.dims.copy(), old.fragile.copy())
+    p = front.placements
+    for sub_row, pos in zip(p.rows.tolist(), p.pos.tolist()):
+        truck.placements.add(len(base) + int(candidates[sub_row]), [pos[0], pos[1] + extent, pos[2]],
+                             int(part.rotation[sub_row]))
+    after = validation.validate(truck)
+    # Eski kutuların yerleşim numaraları değişmez: ihlal listeleri aynı kalmalı
+    if any(after[k] != before[k] for k in after if k not in ("ok", "boxes")):
+        truck.placements = old
+        return extra
+    placed = np.isin(np.arange(len(base), len(combined)), truck.placements.rows)
+    return extra.take(np.flatnonzero(~placed))
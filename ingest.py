@@ -0,0 +1,168 @@
+"""Manifest içe aktarma (Excel, CSV, Parquet).
+
+Dosya parça parça (chunk) okunur; her parça sütun bazında doğrulanır ve
+paketleyicinin satır biçimine (w, l, h, kg, qty, dest, stop, c, fragile,
+rotate) çevrilir. Hatalı satırlar atlanır ve satır numarasıyla raporlanır;
+içe aktarma durmaz.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+import models
+
+CHUNK_SIZE = 50000
+
+# Kabul edilen sütun adları (küçük harf) -> satır anahtarı
+ALIASES = {
+    "width": "w", "w": "w", "en": "w",
+    "length": "l", "l": "l", "boy": "l",
+    "height": "h", "h": "h", "yukseklik": "h", "yükseklik": "h",
+    "weight": "kg", "kg": "kg", "agirlik": "kg", "ağırlık": "kg",
+    "qty": "qty", "quantity": "qty", "adet": "qty",
+    "destination": "dest", "dest": "dest", "durak": "dest",
+    "fragile": "fragile", "kirilabilir": "fragile", "kırılabilir": "fragile",
+    "rotate": "rotate", "can rotate": "rotate", "can_rotate": "rotate",
+}
+REQUIRED = ["w", "l", "h", "kg", "qty"]
+LABELS = {"w": "Width", "l": "Length", "h": "Height", "kg": "Weight", "qty": "Qty",
+          "fragile": "Fragile", "rotate": "Rotate"}
+DEFAULT_DESTINATION = "Ankara"
+DEFAULT_STOP = 1 # Rotada bulunmayan destinasyonlar
+
+TRUE_VALUES = {"1", "1.0", "true", "yes", "y", "x", "evet", "e"}
+FALSE_VALUES = {"0", "0.0", "false", "no", "n", "hayir", "hayır", "h"}
+
+def _kind(source, kind):
+    if kind:
+        return kind.lower().lstrip(".")
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+    return os.path.splitext(str(name))[1].lower().lstrip(".")
+
+def read_chunks(source, kind=None, chunksize=CHUNK_SIZE):
+    """Kaynağı en fazla `chunksize` satırlık DataFrame parçaları olarak okur.
+
+    source dosya yolu ya da dosya benzeri nesne (ör. Streamlit yüklemesi) olabilir.
+    Parquet için pyarrow, xlsx için openpyxl gerekir.
+    """
+    kind = _kind(source, kind)
+    if kind == "csv":
+        yield from pd.read_csv(source, chunksize=chunksize, skipinitialspace=True)
+    elif kind == "parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif kind in ("xlsx", "xlsm"):
+        # Salt okunur modda satırlar akış halinde gelir; kitap belleğe alınmaz
+        from openpyxl import load_workbook
+        book = load_workbook(source, read_only=True, data_only=True)
+        try:
+            rows = book.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            header = ["" if h is None else str(h) for h in header]
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) == chunksize:
+                    yield pd.DataFrame(chunk, columns=header)
+                    chunk = []
+            if chunk:
+                yield pd.DataFrame(chunk, columns=header)
+        finally:
+            book.close()
+    elif kind == "xls":
+        # Eski Excel biçimi akış okumayı desteklemez
+        yield pd.read_excel(source)
+    else:
+        raise ValueError(f"Unsupported manifest format: {kind or source}")
+
+def _flags(column, default, errors, lines, label):
+    """Evet/hayır sütununu bool dizisine çevirir; boş hücre varsayılanı alır."""
+    text = column.astype(str).str.strip().str.lower()
+    empty = column.isna().to_numpy() | (text == "").to_numpy()
+    truthy, falsy = text.isin(TRUE_VALUES).to_numpy(), text.isin(FALSE_VALUES).to_numpy()
+    unknown = ~(empty | truthy | falsy)
+    errors.extend((int(r), f"{label}: unrecognised value") for r in lines[unknown])
+    return np.where(empty, default, truthy), unknown
+
+def normalize(frame, first_line=2):
+    """Bir DataFrame parçasını doğrular; (satırlar, hatalar) döndürür.
+
+    Hatalar (satır numarası, mesaj) listesidir; satır numarası tablodaki
+    konumdur (başlık 1. satır, ilk veri `first_line`).
+    """
+    frame = frame.rename(columns=lambda c: ALIASES.get(str(c).strip().lower(), c))
+    frame = frame.loc[:, ~frame.columns.duplicated()]
+    missing = [LABELS[c] for c in REQUIRED if c not in frame.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    n = len(frame)
+    lines = np.arange(first_line, first_line + n)
+    errors = []
+    bad = np.zeros(n, dtype=bool)
+    out = {}
+    for col in REQUIRED:
+        values = pd.to_numeric(frame[col], errors="coerce").to_numpy(dtype=np.float64)
+        checks = [(np.isnan(values), "missing or not a number"),
+                  (values <= 0, "must be positive")]
+        if col == "qty":
+            checks.append((values != np.floor(values), "must be a whole number"))
+        for mask, message in checks:
+            mask &= ~bad # Satır başına ilk hata yeterli
+            errors.extend((int(r), f"{LABELS[col]}: {message}") for r in lines[mask])
+            bad |= mask
+        out[col] = values
+
+    if "dest" in frame.columns:
+        dest = frame["dest"].astype("string").str.strip().fillna(DEFAULT_DESTINATION)
+        dest = dest.mask(dest == "", DEFAULT_DESTINATION)
+    else:
+        dest = pd.Series(DEFAULT_DESTINATION, index=frame.index, dtype="string")
+    stops = {name: i for i, name in enumerate(models.DESTINATIONS)}
+    stop = dest.map(stops).fillna(DEFAULT_STOP).to_numpy(dtype=np.int64)
+
+    flags = {}
+    for col, default in (("fragile", False), ("rotate", True)):
+        if col in frame.columns:
+            flags[col], unknown = _flags(frame[col], default, errors, lines, LABELS[col])
+            bad |= unknown
+        else:
+            flags[col] = np.full(n, default)
+
+    keep = ~bad
+    measures = {}
+    for c in ("w", "l", "h", "kg"):
+        values = out[c][keep]
+        # Sütun tamamen tam sayıysa int kalır (ekranda 80.0 yerine 80)
+        measures[c] = values.astype(np.int64) if np.all(values == np.floor(values)) else values
+    rows = pd.DataFrame({
+        **measures,
+        "qty": out["qty"][keep].astype(np.int64),
+        "dest": dest.to_numpy(dtype=object)[keep],
+        "stop": stop[keep],
+        "c": np.asarray(models.STOP_COLORS, dtype=object)[stop[keep] % len(models.STOP_COLORS)],
+        "fragile": flags["fragile"][keep].astype(bool),
+        "rotate": flags["rotate"][keep].astype(bool),
+    }).to_dict("records")
+    errors.sort()
+    return rows, errors
+
+def ingest(source, kind=None, chunksize=CHUNK_SIZE, max_errors=1000):
+    """Manifest dosyasını okur ve paketleyici satırlarına çevirir.
+
+    Dönen sözlük: rows (geçerli satırlar), errors ((satır no, mesaj) listesi,
+    en fazla `max_errors` kayıt), skipped (atlanan satır sayısı) ve read
+    (okunan toplam satır).
+    """
+    rows, errors, skipped, read = [], [], 0, 0
+    for chunk in read_chunks(source, kind, chunksize):
+        chunk_rows, chunk_errors = normalize(chunk, first_line=read + 2)
+        rows.extend(chunk_rows)
+        skipped += len(chunk) - len(chunk_rows)
+        errors.extend(chunk_errors[:max(0, max_errors - len(errors))])
+        read += len(chunk)
+    return {"rows": rows, "errors": errors, "skipped": skipped, "read": read}
@@ -0,0 +1,206 @@
+"""Paketleyici için isteğe bağlı ölçüm (sayaçlar, faz süreleri, iz dosyası).
+
+Packer(..., stats=PackStats()) ile açılır. Ölçüm, sadece o Packer örneğinin
+sıcak yol metotlarını sarmalayarak yapılır; stats verilmezse hiçbir metot
+değişmez ve iç döngülere tek bir kontrol bile eklenmez.
+
+Fazlar (saniye, birbirini kapsamaz):
+    sorting     loading_order
+    candidates  aday nokta yönetimi (ekleme, silme, budama, canlılık kontrolü)
+    fit         sınır + çarpışma kontrolü
+    support     destek oranı + kırılganlık kontrolü
+    axle        dingil yükü sınırı kontrolü (sadece sınır tanımlıysa)
+    blocks      blok şekli arama (içindeki destek kontrolleri hariç)
+    batch       toplu motor araması (batch engine)
+    place       yerleşimi tabloya/indekse/yükseklik haritasına yazma
+"""
+import json
+import time
+from collections import defaultdict
+
+import spatial
+
+REJECTION_RULES = ("bounds", "collision", "fragility", "support", "axle")
+
+class PackStats:
+    """Bir veya daha fazla pack çağrısının birikmiş ölçümleri.
+
+    Aday/ret sayaçları ve arama derinliği skaler motorda tutulur; toplu
+    motorda (engine="batch") sadece faz süreleri ölçülür. trace=True ise
+    her arama ve yerleşim olay olarak saklanır ve write_trace ile JSON
+    satırları (JSONL) olarak yazılabilir.
+    """
+    def __init__(self, trace=False):
+        self.trace = trace
+        self.reset()
+
+    def reset(self):
+        self.seconds = 0.0 # pack çağrılarının toplam süresi
+        self.packs = 0
+        self.phases = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.tried = 0 # Denenen (nokta, rotasyon) adayları
+        self.rejected = dict.fromkeys(REJECTION_RULES, 0)
+        self.depths = [] # Her arama için denenen nokta sayısı (skaler motor)
+        self.searches = self.failed_searches = self.placed = 0
+        self.events = []
+        self._suspended = 0 # Blok arama içindeki kontroller aday sayılmaz
+        self._depth = 0
+
+    def summary(self):
+        """JSON'a yazılabilir özet sözlüğü."""
+        depths = sorted(self.depths)
+        def pct(p):
+            return depths[min(len(depths) - 1, int(p * len(depths)))] if depths else 0
+        return {
+            "packs": self.packs, "seconds": round(self.seconds, 6),
+            "phases": {k: round(v, 6) for k, v in self.phases.items()},
+            "calls": dict(self.calls),
+            "placed": self.placed, "searches": self.searches, "failed_searches": self.failed_searches,
+            "candidates_tried": self.tried, "rejected": dict(self.rejected),
+            "search_depth": {"mean": round(sum(depths) / len(depths), 2) if depths else 0,
+                             "p50": pct(0.5), "p95": pct(0.95), "max": depths[-1] if depths else 0},
+        }
+
+    def write_trace(self, path):
+        """Olayları ve en sonda özeti JSONL dosyasına yazar."""
+        with open(path, "w", encoding="utf-8") as f:
+            for event in self.events:
+                f.write(json.dumps(event) + "\n")
+            f.write(json.dumps({"event": "summary", **self.summary()}) + "\n")
+
+    def __repr__(self):
+        s = self.summary()
+        return f"PackStats(placed={s['placed']}, seconds={s['seconds']:.3f}, tried={s['candidates_tried']}, rejected={s['rejected']})"
+
+def _timed(stats, phase, fn, exclusive=()):
+    """fn'i `phase` süresine ekleyerek çalıştıran sarmalayıcı.
+
+    exclusive: fn içinde biriken bu fazların süresi `phase`ten düşülür.
+    """
+    clock = time.perf_counter
+    phases, calls = stats.phases, stats.calls
+    def wrapper(*args, **kwargs):
+        inner = sum(phases[p] for p in exclusive)
+        t0 = clock()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = clock() - t0
+            phases[phase] += elapsed - (sum(phases[p] for p in exclusive) - inner)
+            calls[phase] += 1
+    return wrapper
+
+def instrument_points(points, stats):
+    """ExtremePoints örneğinin metotlarını sayaç/süre tutan sarmalayıcılarla değiştirir."""
+    for name in ("add", "discard", "prune", "_alive", "ordered"):
+        setattr(points, name, _timed(stats, "candidates", getattr(points, name)))
+
+    search = points.search
+    clock = time.perf_counter
+    def counted_search(fn):
+        depth = 0
+        def counting(point):
+            nonlocal depth
+            depth += 1
+            return fn(point)
+        t0 = clock()
+        result = search(counting)
+        stats.searches += 1
+        stats.depths.append(depth)
+        if result is None:
+            stats.failed_searches += 1
+        if stats.trace:
+            stats.events.append({"event": "search", "depth": depth, "found": result is not None,
+                                 "seconds": round(clock() - t0, 6)})
+        return result
+    points.search = counted_search
+    return points
+
+def attach(packer, stats):
+    """Packer örneğinin sıcak yol metotlarını ölçümlü sürümlerle değiştirir."""
+    container = packer.container
+
+    can_place = packer._can_place
+    def fit_check(pos, dims):
+        ok = can_place(pos, dims)
+        if stats._suspended: return ok
+        stats.tried += 1
+        if not ok:
+            C = container.dims
+            out = pos[0] + dims[0] > C[0] or pos[1] + dims[1] > C[1] or pos[2] + dims[2] > C[2]
+            stats.rejected["bounds" if out else "collision"] += 1
+        return ok
+
+    def support_check(pos, dims, weight):
+        # _is_physically_valid ile aynı kural; ret sebebi de kaydedilir
+        if pos[2] == 0: return True
+        code = packer._support_code(pos, dims)
+        if code == spatial.SUPPORT_OK: return True
+        if not stats._suspended:
+            stats.rejected["fragility" if code == spatial.SUPPORT_FRAGILE else "support"] += 1
+        return False
+
+    axle_ok = packer._axle_ok
+    def axle_check(weight, moment_y):
+        ok = axle_ok(weight, moment_y)
+        # Toplu motor dizi ile çağırır; orada sadece faz süreleri ölçülür
+        if ok is False and not stats._suspended:
+            stats.rejected["axle"] += 1
+        return ok
+
+    block_shape = packer._block_shape
+    def blocks(*args):
+        stats._suspended += 1
+        try:
+            return block_shape(*args)
+        finally:
+            stats._suspended -= 1
+
+    place = packer._place
+    def placing(row, point, rot, current_dims):
+        place(row, point, rot, current_dims)
+        stats.placed += 1
+        if stats.trace:
+            stats.events.append({"event": "place", "row": int(row), "position": list(point), "rotation": rot})
+
+    pack = packer.pack
+    def timed_pack(*args, **kwargs):
+        outer = stats._depth == 0 # Item listesi ile çağrı kendini tekrar çağırır
+        stats._depth += 1
+        t0 = time.perf_counter()
+        try:
+            return pack(*args, **kwargs)
+        finally:
+            stats._depth -= 1
+            if outer:
+                stats.seconds += time.perf_counter() - t0
+                stats.packs += 1
+
+    packer._can_place = _timed(stats, "fit", fit_check)
+    packer._is_physically_valid = _timed(stats, "support", support_check)
+    packer._axle_ok = _timed(stats, "axle", axle_check)
+    packer._block_shape = _timed(stats, "blocks", blocks, exclusive=("candidates", "support", "axle"))
+    packer._batch_search = _timed(stats, "batch", packer._batch_search, exclusive=("candidates", "axle"))
+    packer._place = _timed(stats, "place", placing, exclusive=("candidates",))
+    packer.loading_order = _timed(stats, "sorting", packer.loading_order)
+    packer.pack = timed_pack
+    # pack içinde oluşturulan aday nokta yöneticisi de ölçülür
+    packer.make_points = lambda dims, index: instrument_points(type(packer).make_points(packer, dims, index), stats)
+    return packer
+
+def track_progress(packer, callback, every=1):
+    """Her `every` yerleşimde callback(yerleşen adet) çağıran ilerleme kancası.
+
+    PackStats'tan bağımsızdır; sadece _place sarmalanır (ör. iş servisi).
+    """
+    place = packer._place
+    count = 0
+    def placing(*args):
+        nonlocal count
+        place(*args)
+        count += 1
+        if count % every == 0:
+            callback(count)
+    packer._place = placing
+    return packer
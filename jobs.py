@@ -0,0 +1,243 @@
+"""Paketleme iş servisi (yerel süreç havuzu + HTTP API).
+
+İşler (manifest satırları + araç(lar) + strateji) bir süreç havuzunda arka
+planda çözülür; durum, ilerleme ve ara sonuçlar sorgulanabilir. Arayüz
+beklemek yerine durumu yoklar (polling); aynı havuzu birden fazla kullanıcı
+paylaşır, uzun işler birbirinin oturumunu kilitlemez.
+
+HTTP (python jobs.py --port 8765):
+    POST   /jobs                 {"rows": [...], "vehicles": [...], "strategy", "blocks",
+                                  "fleet_mode", "deadline", "axle_limits", "segmented"} -> 202 {"id": ...}
+    GET    /jobs                 tüm işlerin durumu
+    GET    /jobs/<id>            durum, ilerleme ve ara sonuç (anytime geçmişi)
+    GET    /jobs/<id>/plan       bitmiş planın JSON'u (api.plan_to_dict)
+    GET    /jobs/<id>/plan.tlp   bitmiş plan, ikili plan dosyası olarak
+    DELETE /jobs/<id>            kuyruktaki işi iptal eder
+"""
+import argparse
+import json
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import api
+import cache
+import planfile
+
+ACTIVE = ("queued", "running")
+
+def _run(job_id, rows, vehicles, strategy, options, updates):
+    """Havuz sürecinde çalışır; ara durumu paylaşılan sözlüğe yazar."""
+    started = time.time()
+    updates[job_id] = {"state": "running", "started": started}
+    def progress(event):
+        updates[job_id] = {"state": "running", "started": started, **event}
+    return api.solve(rows, vehicles, strategy, progress=progress, **options)
+
+class JobService:
+    """Süreç havuzu üzerinde paketleme işleri.
+
+    submit hemen bir iş numarası döndürür; status ile ilerleme, result ile
+    plan (api.solve sonucu) alınır. plan_cache verilirse aynı manifestin
+    planı havuza gitmeden önbellekten döner ve biten planlar önbelleğe
+    yazılır. Biten işlerin en fazla `keep` tanesi saklanır.
+    """
+    def __init__(self, max_workers=None, plan_cache=None, keep=200):
+        self.plan_cache = plan_cache
+        self.keep = keep
+        self._pool = ProcessPoolExecutor(max_workers=max_workers)
+        # İşçi süreçlerin ilerleme bildirimleri (iş numarası -> son durum)
+        self._manager = multiprocessing.Manager()
+        self._updates = self._manager.dict()
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, rows, vehicles, strategy="balanced", blocks=False, fleet_mode=None, deadline=5.0, axle_limits=None,
+               segmented=False):
+        rows = list(rows)
+        vehicles = api.resolve_vehicles(vehicles, axle_limits)
+        job = {"id": uuid.uuid4().hex[:12], "state": "queued", "strategy": strategy,
+               "vehicles": [v.vehicle_type for v in vehicles], "total": sum(int(r["qty"]) for r in rows),
+               "submitted": time.time(), "finished": None, "cached": False, "plan": None, "error": None,
+               "cache_error": None, "future": None}
+        key = None
+        if self.plan_cache is not None:
+            key = api.plan_key(rows, vehicles, strategy, blocks, fleet_mode, segmented)
+            plan = self.plan_cache.get(key)
+            if plan is not None:
+                job.update(state="done", plan=plan, finished=job["submitted"], cached=True)
+        with self._lock:
+            self._jobs[job["id"]] = job
+            self._prune()
+        if job["state"] == "queued":
+            options = {"blocks": blocks, "fleet_mode": fleet_mode, "deadline": deadline, "segmented": segmented}
+            job["future"] = self._pool.submit(_run, job["id"], rows, vehicles, strategy, options, self._updates)
+            job["future"].add_done_callback(lambda future: self._finish(job, future, key))
+        return job["id"]
+
+    def _finish(self, job, future, key):
+        # Havuzun geri çağırma iş parçacığında çalışır; önbellek kendi kilidiyle korunur
+        if future.cancelled():
+            job["state"] = "cancelled"
+        elif future.exception() is not None:
+            exc = future.exception()
+            job.update(state="failed", error=f"{type(exc).__name__}: {exc}")
+        else:
+            job.update(state="done", plan=future.result())
+            if self.plan_cache is not None:
+                try:
+                    self.plan_cache.put(key, job["plan"])
+                except Exception as exc:
+                    # Önbelleğe yazılamaması işi başarısız yapmaz (ör. disk dolu)
+                    job["cache_error"] = f"{type(exc).__name__}: {exc}"
+        job["finished"] = time.time()
+        self._updates.pop(job["id"], None)
+
+    def _prune(self):
+        finished = [k for k, job in self._jobs.items() if job["state"] not in ACTIVE]
+        for k in finished[:max(0, len(finished) - self.keep)]:
+            del self._jobs[k]
+
+    def status(self, job_id):
+        """İşin JSON'a yazılabilir durumu; bilinmeyen iş için KeyError.
+
+        progress yerleşen birimlerin manifeste oranıdır (filo/portföy işlerinde
+        iş bitene kadar 0). Bitmiş işlerde result araç başına özet içerir.
+        """
+        job = self._jobs[job_id]
+        live = self._updates.get(job_id, {}) if job["state"] in ACTIVE else {}
+        state = live.get("state", job["state"]) if job["state"] in ACTIVE else job["state"]
+        status = {"id": job_id, "state": state, "strategy": job["strategy"], "vehicles": job["vehicles"],
+                  "submitted": job["submitted"], "started": live.get("started"), "finished": job["finished"],
+                  "cached": job["cached"], "total": job["total"], "placed": live.get("placed", 0),
+                  "history": live.get("history"), "error": job["error"],
+                  "cache_error": job["cache_error"]}
+        if job["plan"] is not None:
+            trucks = job["plan"]["fleet"] or [job["plan"]["truck"]]
+            status["placed"] = sum(len(t.placements) for t in trucks)
+            status["history"] = job["plan"]["history"]
+            status["result"] = [api.summarize(t) for t in trucks]
+        status["progress"] = 1.0 if state == "done" else (status["placed"] / job["total"] if job["total"] else 0.0)
+        return status
+
+    def result(self, job_id, timeout=None):
+        """Bitmiş işin planı; gerekirse `timeout` saniye bekler.
+
+        İş başarısız olduysa hatası, iptal edildiyse CancelledError yükselir.
+        """
+        job = self._jobs[job_id]
+        if job["plan"] is not None:
+            return job["plan"]
+        return job["future"].result(timeout)
+
+    def cancel(self, job_id):
+        """Henüz başlamamış işi iptal eder; çalışan işler durdurulamaz."""
+        job = self._jobs[job_id]
+        return job["future"] is not None and job["future"].cancel()
+
+    def jobs(self):
+        with self._lock:
+            ids = list(self._jobs)
+        return [self.status(k) for k in ids]
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+        self._manager.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+def make_handler(service, quiet=False):
+    """JobService'i HTTP üzerinden sunan istek işleyici sınıfı."""
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code, payload, content_type="application/json"):
+            body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _route(self):
+            parts = self.path.split("?")[0].strip("/").split("/")
+            if parts[0] != "jobs" or len(parts) > 3:
+                return None
+            return parts[1:]
+
+        def do_GET(self):
+            route = self._route()
+            if route is None:
+                return self._send(404, {"error": "Not found"})
+            if not route:
+                return self._send(200, service.jobs())
+            try:
+                status = service.status(route[0])
+            except KeyError:
+                return self._send(404, {"error": "Unknown job"})
+            if len(route) == 1:
+                return self._send(200, status)
+            if status["state"] != "done":
+                return self._send(409, {"error": f"Job is {status['state']}"})
+            plan = service.result(route[0])
+            if route[1] == "plan":
+                return self._send(200, api.plan_to_dict(plan))
+            if route[1] == "plan.tlp":
+                return self._send(200, planfile.dumps_plan(plan), "application/octet-stream")
+            self._send(404, {"error": "Not found"})
+
+        def do_POST(self):
+            if self._route() != []:
+                return self._send(404, {"error": "Not found"})
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                job_id = service.submit(request["rows"], request.get("vehicles") or ["Standard Trailer (13.6m)"],
+                                        request.get("strategy", "balanced"), bool(request.get("blocks", False)),
+                                        request.get("fleet_mode"), float(request.get("deadline", 5.0)),
+                                        request.get("axle_limits"), bool(request.get("segmented", False)))
+            except (ValueError, KeyError, TypeError) as exc:
+                return self._send(400, {"error": f"{type(exc).__name__}: {exc}"})
+            self._send(202, {"id": job_id})
+
+        def do_DELETE(self):
+            route = self._route()
+            if not route or len(route) != 1:
+                return self._send(404, {"error": "Not found"})
+            try:
+                cancelled = service.cancel(route[0])
+            except KeyError:
+                return self._send(404, {"error": "Unknown job"})
+            self._send(200 if cancelled else 409, {"cancelled": cancelled})
+
+        def log_message(self, format, *args):
+            if not quiet:
+                super().log_message(format, *args)
+
+    return Handler
+
+def serve(host="127.0.0.1", port=8765, max_workers=None, cache_dir=None, quiet=False):
+    plan_cache = cache.PlanCache(directory=cache_dir) if cache_dir else None
+    with JobService(max_workers, plan_cache) as service:
+        server = ThreadingHTTPServer((host, port), make_handler(service, quiet))
+        print(f"tetralog job service on http://{host}:{server.server_port}/jobs", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the tetralog packing job service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--cache-dir", help="reuse plans of identical manifests across restarts")
+    parser.add_argument("--quiet", action="store_true", help="do not log requests")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, args.cache_dir, args.quiet)
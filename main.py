@@ -1,12 +1,20 @@
 import streamlit as st
 import pandas as pd
 import io
+import os
 import plotly.graph_objects as go
 
 # Modülleri içe aktar (Aynı klasörde olmalılar)
 import ui
+import api
+import ingest
 import models
+import planfile
+import report
+import validation
 import algorithms
+import cache
+import jobs
 import visualization
 
 # 1. UI ve CSS Yükle
@@ -14,9 +22,50 @@ st.set_page_config(page_title="TetraLog Pro", layout="wide", initial_sidebar_sta
 ui.apply_custom_css()
 
 # --- STATE YÖNETİMİ ---
+@st.cache_resource
+def plan_cache():
+    # Tüm oturumlarda ortak; TETRALOG_CACHE_DIR verilirse planlar diske de yazılır
+    return cache.PlanCache(directory=os.environ.get("TETRALOG_CACHE_DIR"))
+
+@st.cache_resource
+def job_service():
+    # Tüm oturumlar aynı süreç havuzunu paylaşır; biten planlar ortak önbelleğe yazılır
+    return jobs.JobService(plan_cache=plan_cache())
+
+@st.fragment(run_every=1.0)
+def job_progress():
+    # Çalışan işi yokla; bitince planı bağla ve sayfayı yeniden çiz
+    job = st.session_state.get('job')
+    if not job: return
+    status = job_service().status(job["id"])
+    if status["state"] in ("queued", "running"):
+        text = "Waiting for a free worker..." if status["state"] == "queued" else f"Packing: {status['placed']}/{status['total']} units placed"
+        st.progress(status["progress"], text=text)
+        if status["state"] == "queued" and st.button("Cancel Job"):
+            job_service().cancel(job["id"])
+        return
+    del st.session_state['job']
+    if status["state"] == "done":
+        show_plan(job_service().result(job["id"]), job["strategy"])
+    else:
+        st.session_state.job_error = status["error"] or "Job cancelled"
+    st.rerun()
+
 def clear_results():
     if 'calc_done' in st.session_state: del st.session_state['calc_done']
     if 'truck' in st.session_state: del st.session_state['truck']
+    if 'fleet' in st.session_state: del st.session_state['fleet']
+    st.session_state.pop('job', None) # Bekleyen iş bırakılır (sonucu yine önbelleğe yazılır)
+
+def show_plan(plan, strategy):
+    # Çözülen ya da dosyadan açılan planı ekrana bağla
+    st.session_state.fleet = plan["fleet"]
+    if plan["history"] is not None:
+        st.session_state.search_history = plan["history"]
+    st.session_state.calc_done = True
+    st.session_state.strategy = strategy
+    st.session_state.truck = plan["truck"]
+    st.session_state.cargo_items = plan["items"]
 
 # --- HEADER ---
 st.markdown('<div class="main-header">TetraLog Pro</div>', unsafe_allow_html=True)
@@ -24,22 +73,30 @@ st.markdown('<div class="sub-header">Advanced Logistics Optimization Engine (v4.
 
 # --- SIDEBAR ---
 st.sidebar.header("Operational Config")
-arac_tipi = st.sidebar.selectbox("Vehicle Type", ["Standard Trailer (13.6m)", "Truck (8m)", "Van"], on_change=clear_results)
-
-if arac_tipi == "Standard Trailer (13.6m)": 
-    v_dims = [240, 1360, 270]; max_tonaj = 24000
-elif arac_tipi == "Truck (8m)": 
-    v_dims = [240, 800, 270]; max_tonaj = 15000
-else: 
-    v_dims = [190, 350, 190]; max_tonaj = 3500
+arac_tipi = st.sidebar.selectbox("Vehicle Type", list(models.VEHICLE_PRESETS), on_change=clear_results)
+v_dims, max_tonaj = models.VEHICLE_PRESETS[arac_tipi]
 
 st.sidebar.markdown(f"**📏 Dims:** {v_dims[0]}x{v_dims[1]}x{v_dims[2]} cm")
 st.sidebar.markdown(f"**⚖️ Cap:** {max_tonaj:,} kg")
 
+# FİLO MODU: Manifest birden fazla araca bölünür
+fleet_mode = st.sidebar.toggle("Fleet Mode (Multi-Vehicle)", on_change=clear_results)
+fleet_counts = {}
+if fleet_mode:
+    for preset in models.VEHICLE_PRESETS:
+        fleet_counts[preset] = st.sidebar.number_input(preset, 0, 20, 1 if preset == arac_tipi else 0, on_change=clear_results)
+
+# DİNGİL SINIRLARI: 0 = sınırsız; verilirse aşan yerleşimler yapılmaz
+axle_limits = None
+if st.sidebar.toggle("Axle Load Limits", on_change=clear_results):
+    front_limit = st.sidebar.number_input("Front Axle Max (kg)", 0, 100000, 0, step=500, on_change=clear_results)
+    rear_limit = st.sidebar.number_input("Rear Axle Max (kg)", 0, 100000, 0, step=500, on_change=clear_results)
+    axle_limits = (front_limit or None, rear_limit or None)
+
 st.sidebar.divider()
 st.sidebar.subheader("Manifest")
-tab1, tab2 = st.sidebar.tabs(["Manual", "Excel"])
-duraklar = ["Istanbul", "Kocaeli", "Ankara", "Erzurum"]
+tab1, tab2, tab3 = st.sidebar.tabs(["Manual", "Excel", "Open Plan"])
+duraklar = models.DESTINATIONS
 
 if 'koli_listesi' not in st.session_state: st.session_state.koli_listesi = []
 
@@ -60,13 +117,21 @@ with tab1:
         rotate = st.checkbox("Can Rotate?", value=True)
         
         if st.form_submit_button("Add Item", type="secondary"):
-            colors = ['#e74c3c', '#3498db', '#f1c40f', '#8e44ad', '#27ae60']
-            st.session_state.koli_listesi.append({
+            colors = models.STOP_COLORS
+            new_row = {
                 "w":w, "l":l, "h":h, "kg":kg, "qty":qty, 
                 "dest":dest, "stop":stop_idx, "c":colors[stop_idx%5],
                 "fragile": fragile, "rotate": rotate
-            })
-            st.toast("Item Added", icon="✅")
+            }
+            st.session_state.koli_listesi.append(new_row)
+            if st.session_state.get('calc_done') and not st.session_state.get('fleet'):
+                # Geç gelen palet: tüm planı değil, sadece etkilenen bölgeyi yeniden planla
+                truck = st.session_state.truck
+                st.session_state.cargo_items = algorithms.Packer(truck).repack(
+                    added=models.ItemTable.from_rows([new_row]), strategy=api.packer_strategy(st.session_state.get('strategy', "balanced")))
+                st.toast("Item Added (plan updated)", icon="✅")
+            else:
+                st.toast("Item Added", icon="✅")
 
 # --- TAB 2: EXCEL YÜKLEME (DÜZELTİLDİ) ---
 with tab2:
@@ -76,7 +141,8 @@ with tab2:
     sample_data = pd.DataFrame({
         'Width': [80, 100], 'Length': [120, 100], 'Height': [100, 150], 
         'Weight': [20, 15], 'Qty': [10, 5], 
-        'Destination': ['Ankara', 'Kocaeli']
+        'Destination': ['Ankara', 'Kocaeli'],
+        'Fragile': ['no', 'yes'], 'Rotate': ['yes', 'yes']
     })
     buffer = io.BytesIO()
     with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
@@ -90,52 +156,47 @@ with tab2:
         type="secondary"
     )
     
-    # 2. Dosya Yükleme ve Okuma
-    uploaded_file = st.file_uploader("Select Excel File", type=["xlsx", "xls"])
+    # 2. Dosya Yükleme ve Okuma (parça parça okunur, sütun bazında doğrulanır)
+    uploaded_file = st.file_uploader("Select Manifest File", type=["xlsx", "xls", "csv", "parquet"])
     
     if uploaded_file is not None:
         if st.button("Import Data", type="primary"):
             try:
-                df = pd.read_excel(uploaded_file)
-                # Listeyi Temizle
-                st.session_state.koli_listesi = []
-                colors = ['#e74c3c', '#3498db', '#f1c40f', '#8e44ad', '#27ae60']
-                
-                for index, row in df.iterrows():
-                    # Durak Kontrolü
-                    d_name = row['Destination'] if 'Destination' in row else 'Ankara'
-                    try:
-                        s_idx = duraklar.index(d_name)
-                    except:
-                        s_idx = 1 # Bulamazsa varsayılan
-                    
-                    color = colors[s_idx % 5]
-                    
-                    st.session_state.koli_listesi.append({
-                        "w": int(row['Width']), 
-                        "l": int(row['Length']), 
-                        "h": int(row['Height']), 
-                        "kg": int(row['Weight']), 
-                        "qty": int(row['Qty']), 
-                        "dest": d_name, 
-                        "stop": s_idx, 
-                        "c": color,
-                        "fragile": False, # Excel'den gelmiyorsa varsayılan False
-                        "rotate": True    # Excel'den gelmiyorsa varsayılan True
-                    })
-                
-                st.success(f"{len(df)} rows imported successfully!")
+                result = ingest.ingest(uploaded_file)
+                st.session_state.koli_listesi = result["rows"]
+                st.session_state.import_report = result
                 clear_results()
                 st.rerun()
                 
             except Exception as e:
                 st.error(f"Error reading file: {e}")
+    
+    # Son içe aktarmanın özeti; hatalı satırlar atlanır ve listelenir
+    import_summary = st.session_state.get('import_report')
+    if import_summary:
+        st.success(f"{len(import_summary['rows'])} of {import_summary['read']} rows imported successfully!")
+        if import_summary["skipped"]:
+            st.warning(f"{import_summary['skipped']} rows skipped")
+            with st.expander("Row Errors"):
+                st.dataframe(pd.DataFrame(import_summary["errors"], columns=["Row", "Problem"]), hide_index=True)
+
+# --- TAB 3: KAYITLI PLAN (.tlp) ---
+with tab3:
+    # Arşivlenmiş plan yeniden paketlenmeden açılır (görselleştirme, aks yükü, PDF)
+    plan_file = st.file_uploader("Select Plan File", type=["tlp"])
+    if plan_file is not None and st.button("Open Plan", type="primary"):
+        try:
+            show_plan(planfile.load_plan(plan_file), "balanced")
+            st.rerun()
+        except ValueError as e:
+            st.error(f"Error reading plan: {e}")
 
 if st.session_state.koli_listesi:
     st.sidebar.divider()
     st.sidebar.markdown(f"**📊 Total Items:** {len(st.session_state.koli_listesi)}")
     if st.sidebar.button("Clear Manifest", type="secondary"):
         st.session_state.koli_listesi = []
+        st.session_state.pop('import_report', None)
         clear_results()
         st.rerun()
 
@@ -146,61 +207,91 @@ with c1:
     st.subheader("Optimization Analysis")
     
     # Strateji Seçimi
-    strategy = st.selectbox("Algo Strategy", ["Balanced (LIFO)", "Density (Heavy Bottom)"])
+    strategy = st.selectbox("Algo Strategy", ["Balanced (LIFO)", "Density (Heavy Bottom)", "Portfolio (Best of All)", "Anytime Search (5s)"])
+    # Aynı SKU'ları blok/katman halinde yerleştir (yüksek adetli manifestlerde çok daha hızlı)
+    block_mode = st.checkbox("Block Stacking (Identical SKUs)", value=True)
+    # Çok duraklı rotalarda her durak bölgesi ayrı süreçte paketlenir (dingil sınırlarıyla kullanılamaz)
+    zone_mode = st.checkbox("Stop Zones (Parallel)", value=False, disabled=axle_limits is not None,
+                            help="Pack each stop's zone of the vehicle in parallel, then stitch. Balanced/Density only.")
     
     if st.button("RUN OPTIMIZATION ENGINE", type="primary", use_container_width=True):
         if not st.session_state.koli_listesi:
             st.warning("Empty Manifest")
         else:
             # Nesneleri Oluştur
-            truck = models.Container(v_dims[0], v_dims[1], v_dims[2], max_tonaj)
-            items = []
-            for i, k in enumerate(st.session_state.koli_listesi):
-                for _ in range(k['qty']):
-                    items.append(models.Item(
-                        "Box", k['w'], k['l'], k['h'], k['kg'], 
-                        k['dest'], k['stop'], k['c'], 
-                        k['fragile'], k['rotate']
-                    ))
-            
-            # Algoritmayı Çalıştır
-            packer = algorithms.Packer(truck)
-            with st.spinner("Calculating Physics, Stability & Axle Loads..."):
-                packer.pack(items, strategy)
+            if fleet_mode:
+                vehicles = [p for p, n in fleet_counts.items() for _ in range(n)] or [arac_tipi]
+            else:
+                vehicles = [arac_tipi]
             
-            st.session_state.calc_done = True
-            st.session_state.truck = truck
-            st.session_state.cargo_items = items
-            st.session_state.fitted = len(truck.placed_items)
+            # İş servisine gönder; oturum beklemeden ilerlemeyi yoklar (önbellekteki planlar hemen döner)
+            clear_results()
+            job_id = job_service().submit(st.session_state.koli_listesi, vehicles, strategy,
+                                          blocks=block_mode, fleet_mode=fleet_mode, axle_limits=axle_limits,
+                                          segmented=zone_mode and axle_limits is None)
+            st.session_state.job = {"id": job_id, "strategy": strategy}
+
+    if st.session_state.get('job'):
+        job_progress()
+
+    if st.session_state.get('job_error'):
+        st.error(f"Optimization failed: {st.session_state.pop('job_error')}")
 
     if st.session_state.get('calc_done'):
         truck = st.session_state.truck
         items = st.session_state.cargo_items
-        fitted = st.session_state.fitted
+        if st.session_state.get('fleet'):
+            vehicles = st.session_state.fleet
+            total_fitted = sum(len(v.placed_items) for v in vehicles)
+            st.metric("Fleet Loaded", f"{total_fitted}/{len(items)} in {len(vehicles)} vehicles")
+            v_idx = st.selectbox("Vehicle", range(len(vehicles)),
+                                 format_func=lambda i: f"#{i + 1} {vehicles[i].vehicle_type} ({len(vehicles[i].placed_items)} units)")
+            truck = st.session_state.truck = vehicles[v_idx]
+        fitted = len(truck.placed_items)
+        v_dims, max_tonaj = truck.dims, truck.max_weight
         
         # Hesaplamalar
-        vol_usage = sum([i.volume for i in truck.placed_items]) / 1000000
-        total_w = sum([i.weight for i in truck.placed_items])
-        f_load, r_load = algorithms.Packer(truck).calculate_axle_loads() # Aks Yükü
+        vol_usage = truck.placements.volume.sum() / 1000000
+        total_w = float(truck.placements.weight.sum())
+        f_load, r_load = truck.axle_loads() # Aks Yükü (yerleşim toplamlarından, yeniden hesaplamasız)
         
         m1, m2 = st.columns(2)
         m1.metric("Fill Rate", f"{fitted}/{len(items)}")
         m2.metric("Vol Usage", f"{vol_usage:.2f} m3")
         
+        if strategy.startswith("Anytime") and st.session_state.get('search_history'):
+            history = pd.DataFrame(st.session_state.search_history, columns=["Time (s)", "Placed", "Fill Rate"])
+            st.line_chart(history, x="Time (s)", y="Fill Rate", height=150)
+        
         st.divider()
         
         # Aks Yükü Görseli
         st.markdown(f"**🚛 Axle Load Distribution**")
-        st.progress(f_load / (total_w + 1), text=f"Front Axle: {f_load:.0f}kg | Rear Axle: {r_load:.0f}kg")
+        st.progress(min(max(f_load / (total_w + 1), 0.0), 1.0), text=f"Front Axle: {f_load:.0f}kg | Rear Axle: {r_load:.0f}kg")
+        cog = truck.placements.cog
+        if cog:
+            st.caption(f"Center of Gravity: {cog[1]:.0f} cm from cab, {cog[0] - v_dims[0] / 2:+.0f} cm lateral, {cog[2]:.0f} cm high")
         
         if total_w > max_tonaj:
-            st.error(f"🚨 OVERWEIGHT: {total_w} / {max_tonaj} kg")
+            st.error(f"🚨 OVERWEIGHT: {total_w:.0f} / {max_tonaj} kg")
         else:
-            st.success(f"✅ Weight Compliance: {total_w} / {max_tonaj} kg")
+            st.success(f"✅ Weight Compliance: {total_w:.0f} / {max_tonaj} kg")
+
+        # Bağımsız plan doğrulaması (çakışma, destek, kırılgan, durak sırası)
+        check = validation.validate(truck)
+        if check["ok"]:
+            st.success(f"✅ Plan Check: {validation.summary(check)}")
+        else:
+            st.warning(f"⚠️ Plan Check: {validation.summary(check)}")
             
         st.divider()
-        pdf_bytes = ui.create_pdf(truck, items, fitted, (f_load, r_load))
-        st.download_button("Download Report", pdf_bytes, "report.pdf", "application/pdf", type="secondary")
+        # Rapor ve plan dosyası her yeniden çalıştırmada değil, sadece indirme anında üretilir
+        axle_loads = (f_load, r_load)
+        st.download_button("Download Report", lambda: report.plan_pdf(truck, items, axle_loads),
+                           "report.pdf", "application/pdf", type="secondary")
+        history = st.session_state.get('search_history') if strategy.startswith("Anytime") else None
+        plan = {"items": items, "truck": truck, "fleet": st.session_state.get('fleet'), "history": history}
+        st.download_button("Download Plan", lambda: planfile.dumps_plan(plan), "plan.tlp", "application/octet-stream", type="secondary")
 
 with c2:
     st.markdown('<div class="plotly-container">', unsafe_allow_html=True)
@@ -210,24 +301,28 @@ with c2:
         truck = st.session_state.truck
         
         # --- UX: GÖRÜNÜM AYARLARI ---
+        # Geometri plan başına bir kez kurulur; slider/renk değişimi sadece dilimler
+        geometry = visualization.plan_geometry(truck.placements)
         vis_col1, vis_col2 = st.columns(2)
         with vis_col1:
-            # ADIM ADIM ANİMASYON SLIDER
-            step = st.slider("Loading Sequence (Time)", 0, fitted, fitted)
+            # Tarayıcıda oynatma: sunucuya gidip gelmeden kare kare yükleme sırası
+            client_anim = st.toggle("Play in Browser", value=False)
+            if not client_anim:
+                # ADIM ADIM ANİMASYON SLIDER
+                step = st.slider("Loading Sequence (Time)", 0, fitted, fitted)
         with vis_col2:
             # RENK MODU SEÇİMİ
             color_mode = st.radio("Color Mode", ["Destination", "Weight Based"], horizontal=True)
         
-        # Sadece seçilen adıma kadar olanları filtrele
-        visible_items = truck.placed_items[:step]
-        
-        fig = go.Figure()
-        fig.add_trace(visualization.draw_truck_borders(v_dims[0], v_dims[1], v_dims[2]))
-        
-        for item in visible_items:
-            fig.add_trace(visualization.get_cube_trace(item, color_mode))
-            
-        fig.add_trace(visualization.get_wireframe_traces(visible_items))
+        borders = visualization.draw_truck_borders(v_dims[0], v_dims[1], v_dims[2])
+        if client_anim:
+            fig = geometry.animated_figure(borders, color_mode)
+        else:
+            fig = go.Figure()
+            fig.add_trace(borders)
+            # Sadece seçilen adıma kadar olanlar, renk grubu başına tek Mesh3d
+            fig.add_traces(geometry.mesh_traces(color_mode, step))
+            fig.add_trace(geometry.wireframe_trace(step))
         
         fig.update_layout(
             scene=dict(
@@ -1,33 +1,352 @@
+import numpy as np
+
+def _py(value):
+    # NumPy skalerini tam sayıysa int, değilse float olarak döndür (ekranda 80.0 yerine 80)
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+def _encode(values):
+    """Metin sütununu (kodlar, kategoriler) çiftine çevirir."""
+    if isinstance(values, str):
+        return np.zeros(1, dtype=np.int32), [values]
+    categories = {}
+    codes = np.fromiter((categories.setdefault(v, len(categories)) for v in values), dtype=np.int32)
+    return codes, list(categories)
+
+class ItemTable:
+    """Ürünlerin sütun bazlı (structure-of-arrays) tablosu.
+
+    Her satır bir koli birimidir. Ölçüler, ağırlık, durak sırası ve bayraklar
+    NumPy dizilerinde; destinasyon/renk/isim gibi metinler kategori kodları
+    olarak tutulur. Yerleşim verisi (position, rotation) de tabloda saklanır.
+    """
+    def __init__(self, dims, weight, stop_order, dest_codes, destinations, color_codes, colors,
+                 fragile, can_rotate, name_codes, names, copy=True):
+        # copy=False: uygun tipteki diziler kopyalanmadan kullanılır (ör. bellek eşlemli plan dosyası)
+        array = np.array if copy else np.asarray
+        self.dims = array(dims, dtype=np.float64).reshape(-1, 3) # [En, Boy, Yükseklik]
+        n = len(self.dims)
+        self.weight = array(weight, dtype=np.float64)
+        self.stop_order = array(stop_order, dtype=np.int32)
+        self.fragile = array(fragile, dtype=bool)
+        self.can_rotate = array(can_rotate, dtype=bool)
+        self.dest_codes, self.destinations = array(dest_codes, dtype=np.int32), list(destinations)
+        self.color_codes, self.colors = array(color_codes, dtype=np.int32), list(colors)
+        self.name_codes, self.names = array(name_codes, dtype=np.int32), list(names)
+        self.volume = self.dims.prod(axis=1)
+
+        # Konumlandırma verileri
+        self.position = np.zeros((n, 3))
+        self.rotation = np.zeros(n, dtype=np.int8) # 0: Normal, 1: Döndürülmüş
+
+    @classmethod
+    def from_columns(cls, dims, weight, stop_order, destination, color, fragile=False, can_rotate=True, name="Box"):
+        """Sütunlardan tablo kurar; metin sütunları tek değer de olabilir."""
+        dims = np.asarray(dims, dtype=np.float64).reshape(-1, 3)
+        n = len(dims)
+        dest_codes, destinations = _encode(destination)
+        color_codes, colors = _encode(color)
+        name_codes, names = _encode(name)
+        return cls(dims, np.broadcast_to(weight, n), np.broadcast_to(stop_order, n),
+                   np.broadcast_to(dest_codes, n), destinations,
+                   np.broadcast_to(color_codes, n), colors,
+                   np.broadcast_to(fragile, n), np.broadcast_to(can_rotate, n),
+                   np.broadcast_to(name_codes, n), names)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Manifest satırlarını (w, l, h, kg, qty, dest, stop, c, fragile, rotate) birimlere açar."""
+        qty = np.array([int(r['qty']) for r in rows], dtype=np.int64)
+        dest_codes, destinations = _encode([r['dest'] for r in rows])
+        color_codes, colors = _encode([r['c'] for r in rows])
+
+        def rep(values, dtype):
+            return np.repeat(np.array(values, dtype=dtype), qty, axis=0)
+
+        n = int(qty.sum())
+        return cls(rep([[r['w'], r['l'], r['h']] for r in rows], np.float64).reshape(n, 3),
+                   rep([r['kg'] for r in rows], np.float64),
+                   rep([r['stop'] for r in rows], np.int32),
+                   np.repeat(dest_codes, qty), destinations,
+                   np.repeat(color_codes, qty), colors,
+                   rep([r.get('fragile', False) for r in rows], bool),
+                   rep([r.get('rotate', True) for r in rows], bool),
+                   np.zeros(n, dtype=np.int32), ["Box"])
+
+    @classmethod
+    def from_items(cls, items):
+        return cls.from_columns([i.dims for i in items], [i.weight for i in items],
+                                [i.stop_order for i in items], [i.destination for i in items],
+                                [i.color for i in items], [i.fragile for i in items],
+                                [i.can_rotate for i in items], [i.name for i in items])
+
+    def __len__(self):
+        return len(self.dims)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [Item.view(self, r) for r in range(*row.indices(len(self)))]
+        if row < 0: row += len(self)
+        if not 0 <= row < len(self): raise IndexError(row)
+        return Item.view(self, row)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield Item.view(self, row)
+
+    def rotated_dims(self, rows=None):
+        """Döndürme uygulanmış ölçüler (rows verilmezse tüm tablo)."""
+        if rows is None: rows = slice(None)
+        dims = self.dims[rows].copy()
+        rot = self.rotation[rows] == 1
+        dims[rot, 0], dims[rot, 1] = self.dims[rows][rot, 1], self.dims[rows][rot, 0]
+        return dims
+
+    def take(self, rows):
+        """Seçilen satırlardan yeni (kopya) tablo; kategori listeleri paylaşılır."""
+        rows = np.asarray(rows, dtype=np.int64)
+        t = ItemTable(self.dims[rows], self.weight[rows], self.stop_order[rows],
+                      self.dest_codes[rows], self.destinations, self.color_codes[rows], self.colors,
+                      self.fragile[rows], self.can_rotate[rows], self.name_codes[rows], self.names)
+        t.position[:] = self.position[rows]
+        t.rotation[:] = self.rotation[rows]
+        return t
+
+    def copy(self):
+        return self.take(np.arange(len(self)))
+
+    @classmethod
+    def concat(cls, tables):
+        """Tabloları alt alta ekler, kategori kodlarını yeniden eşler."""
+        def merge(code_attr, cat_attr):
+            categories, codes = {}, []
+            for t in tables:
+                remap = np.array([categories.setdefault(c, len(categories)) for c in getattr(t, cat_attr)], dtype=np.int32)
+                codes.append(remap[getattr(t, code_attr)])
+            return np.concatenate(codes), list(categories)
+        dest_codes, destinations = merge('dest_codes', 'destinations')
+        color_codes, colors = merge('color_codes', 'colors')
+        name_codes, names = merge('name_codes', 'names')
+        out = cls(np.concatenate([t.dims for t in tables]), np.concatenate([t.weight for t in tables]),
+                  np.concatenate([t.stop_order for t in tables]), dest_codes, destinations,
+                  color_codes, colors, np.concatenate([t.fragile for t in tables]),
+                  np.concatenate([t.can_rotate for t in tables]), name_codes, names)
+        out.position[:] = np.concatenate([t.position for t in tables])
+        out.rotation[:] = np.concatenate([t.rotation for t in tables])
+        return out
+
 class Item:
+    """ItemTable içindeki tek bir satırın görünümü (eski arayüzle uyumluluk için)."""
+    __slots__ = ("table", "row")
+
     def __init__(self, name, width, length, height, weight, destination, stop_order, color, fragile=False, can_rotate=True):
-        self.name = name
-        self.dims = [width, length, height] # [En, Boy, Yükseklik]
-        self.weight = weight
-        self.volume = width * length * height
-        self.destination = destination
-        self.stop_order = stop_order
-        self.color = color
-        self.fragile = fragile # Kırılgan mı? (Üstüne yük binemez)
-        self.can_rotate = can_rotate # Döndürülebilir mi?
-        
-        # Konumlandırma verileri
-        self.position = [0, 0, 0] 
-        self.rotation_type = 0 # 0: Normal, 1: Döndürülmüş
+        # Tek başına oluşturulan ürün, tek satırlık kendi tablosunu taşır
+        self.table = ItemTable.from_columns([width, length, height], weight, stop_order,
+                                            destination, color, fragile, can_rotate, name)
+        self.row = 0
+
+    @classmethod
+    def view(cls, table, row):
+        item = cls.__new__(cls)
+        item.table = table
+        item.row = row
+        return item
+
+    name = property(lambda self: self.table.names[self.table.name_codes[self.row]])
+    destination = property(lambda self: self.table.destinations[self.table.dest_codes[self.row]])
+    color = property(lambda self: self.table.colors[self.table.color_codes[self.row]])
+    dims = property(lambda self: [_py(v) for v in self.table.dims[self.row]])
+    weight = property(lambda self: _py(self.table.weight[self.row]))
+    volume = property(lambda self: _py(self.table.volume[self.row]))
+    stop_order = property(lambda self: int(self.table.stop_order[self.row]))
+    fragile = property(lambda self: bool(self.table.fragile[self.row])) # Kırılgan mı? (Üstüne yük binemez)
+    can_rotate = property(lambda self: bool(self.table.can_rotate[self.row])) # Döndürülebilir mi?
+
+    @property
+    def position(self):
+        return [_py(v) for v in self.table.position[self.row]]
+
+    @position.setter
+    def position(self, value):
+        self.table.position[self.row] = value
+
+    @property
+    def rotation_type(self):
+        return int(self.table.rotation[self.row])
+
+    @rotation_type.setter
+    def rotation_type(self, value):
+        self.table.rotation[self.row] = value
 
     def get_dimension(self):
         # Döndürülmüşse En ve Boy yer değiştirir
+        dims = self.dims
         if self.rotation_type == 1:
-            return [self.dims[1], self.dims[0], self.dims[2]]
-        return self.dims
+            return [dims[1], dims[0], dims[2]]
+        return dims
+
+class PlacementTable:
+    """Yerleştirilen kutuların yükleme sırasına göre sütun bazlı kaydı.
+
+    `rows` ItemTable satırlarını gösterir; konum ve (döndürülmüş) ölçüler
+    paketleyicinin vektörel kontrolleri için ayrıca tutulur. Dizi/dilim
+    erişimi eski `placed_items` listesi gibi Item görünümleri döndürür.
+    """
+    def __init__(self, items=None, capacity=64):
+        self.items = items
+        self.count = 0
+        self._rows = np.empty(capacity, dtype=np.int64)
+        self._pos = np.empty((capacity, 3))
+        self._dims = np.empty((capacity, 3))
+        self._fragile = np.empty(capacity, dtype=bool)
+        # Yerleşirken tutulan toplamlar: ağırlık ve (x, y, z) eksenlerinde ağırlık momenti
+        self.total_weight = 0.0
+        self.moment = [0.0, 0.0, 0.0]
+
+    @classmethod
+    def from_arrays(cls, items, rows, pos, dims, fragile):
+        """Hazır dizilerden (kopyalamadan) tablo; yeni ekleme olursa diziler büyütülürken kopyalanır."""
+        table = cls(items, capacity=0)
+        table._rows, table._pos, table._dims, table._fragile = rows, pos, dims, fragile
+        table.count = len(rows)
+        if items is not None and len(rows):
+            weight = items.weight[rows]
+            table.total_weight = float(weight.sum())
+            table.moment = (weight @ (np.asarray(pos) + np.asarray(dims) / 2)).tolist()
+        return table
+
+    def _grow(self):
+        capacity = max(64, 2 * len(self._rows))
+        for name in ("_rows", "_pos", "_dims", "_fragile"):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def bind(self, items):
+        if self.items is not items:
+            if self.count:
+                raise ValueError("Container already holds placements from another ItemTable")
+            self.items = items
+
+    def rebase(self, items):
+        """Yerleşimleri, mevcut tablonun sonuna satır eklenmiş `items` tablosuna taşır.
+
+        Satır numaraları değişmez; `items` genelde ItemTable.concat([eski, yeni]) ile kurulur.
+        """
+        if self.items is not None and len(items) < len(self.items):
+            raise ValueError("New ItemTable must extend the current one")
+        self.items = items
+
+    def add(self, row, pos, rotation=0):
+        """`row` satırını `pos` noktasına yerleştirir, yerleşim sırasını döndürür."""
+        if self.count == len(self._rows): self._grow()
+        items = self.items
+        items.position[row] = pos
+        items.rotation[row] = rotation
+        d = items.dims[row]
+        n = self.count
+        self._rows[n] = row
+        self._pos[n] = pos
+        self._dims[n] = (d[1], d[0], d[2]) if rotation == 1 else d
+        self._fragile[n] = items.fragile[row]
+        self.count = n + 1
+        w = float(items.weight[row])
+        if w:
+            centre = (self._pos[n] + self._dims[n] / 2).tolist()
+            self.total_weight += w
+            self.moment = [m + w * c for m, c in zip(self.moment, centre)]
+        return n
+
+    def append(self, item):
+        """Eski arayüz: Item görünümünü mevcut konum/rotasyonuyla ekler."""
+        self.bind(item.table)
+        return self.add(item.row, item.table.position[item.row], item.rotation_type)
+
+    rows = property(lambda self: self._rows[:self.count])
+    pos = property(lambda self: self._pos[:self.count])
+    dims = property(lambda self: self._dims[:self.count])
+    fragile = property(lambda self: self._fragile[:self.count])
+    weight = property(lambda self: self.items.weight[self.rows] if self.items is not None else np.zeros(0))
+    volume = property(lambda self: self.items.volume[self.rows] if self.items is not None else np.zeros(0))
+
+    @property
+    def cog(self):
+        """Yükün ağırlık merkezi [x, y, z] (cm); boş ya da ağırlıksızsa None."""
+        if not self.total_weight: return None
+        return [m / self.total_weight for m in self.moment]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, n):
+        if isinstance(n, slice):
+            return [Item.view(self.items, r) for r in self.rows[n].tolist()]
+        if n < 0: n += self.count
+        if not 0 <= n < self.count: raise IndexError(n)
+        return Item.view(self.items, int(self._rows[n]))
+
+    def __iter__(self):
+        for r in self.rows.tolist():
+            yield Item.view(self.items, r)
+
+# Araç tipleri: iç ölçüler [En, Boy, Yükseklik] (cm) ve tonaj (kg)
+VEHICLE_PRESETS = {
+    "Standard Trailer (13.6m)": ([240, 1360, 270], 24000),
+    "Truck (8m)": ([240, 800, 270], 15000),
+    "Van": ([190, 350, 190], 3500),
+}
+
+# Rota: liste sırası durak numarasıdır (0 = çıkış deposu)
+DESTINATIONS = ["Istanbul", "Kocaeli", "Ankara", "Erzurum"]
+STOP_COLORS = ['#e74c3c', '#3498db', '#f1c40f', '#8e44ad', '#27ae60']
 
 class Container:
     def __init__(self, width, length, height, max_weight):
         self.dims = [width, length, height]
         self.max_weight = max_weight
-        self.placed_items = []
+        self.placements = PlacementTable()
+        self.vehicle_type = None
         self.total_volume = width * length * height
-        
+
         # Aks Yükü için varsayılan dingil mesafeleri (cm cinsinden)
         # Ön aks: Kabine yakın, Arka aks: Dorsenin arkasında
-        self.axle_front_pos = 100 
-        self.axle_rear_pos = length - 150
\ No newline at end of file
+        self.axle_front_pos = 100
+        self.axle_rear_pos = length - 150
+        # İsteğe bağlı dingil yük sınırları (kg); verilirse paketleyici aşan yerleşimleri reddeder
+        self.axle_front_limit = None
+        self.axle_rear_limit = None
+
+    @classmethod
+    def from_preset(cls, name):
+        dims, max_weight = VEHICLE_PRESETS[name]
+        container = cls(dims[0], dims[1], dims[2], max_weight)
+        container.vehicle_type = name
+        return container
+
+    def empty_copy(self):
+        """Aynı ölçü/kapasite/aks ayarlarıyla boş konteyner."""
+        container = Container(self.dims[0], self.dims[1], self.dims[2], self.max_weight)
+        container.axle_front_pos = self.axle_front_pos
+        container.axle_rear_pos = self.axle_rear_pos
+        container.axle_front_limit = self.axle_front_limit
+        container.axle_rear_limit = self.axle_rear_limit
+        container.vehicle_type = self.vehicle_type
+        return container
+
+    def axle_split(self, weight, moment_y):
+        """Toplam ağırlık ve Y momentinden (ön, arka) dingil yükleri (moment kolu kuralı)."""
+        if weight == 0: return 0, 0
+        # Arka aksa binen yük: ağırlık merkezinin ön aksa uzaklığı / dingil mesafesi
+        rear = (moment_y - weight * self.axle_front_pos) / (self.axle_rear_pos - self.axle_front_pos)
+        return weight - rear, rear
+
+    def axle_loads(self):
+        """Yüklü planın (ön, arka) dingil yükleri; yerleşim toplamlarından O(1)."""
+        placements = self.placements
+        return self.axle_split(placements.total_weight, placements.moment[1])
+
+    @property
+    def placed_items(self):
+        # Yükleme sırasına göre Item görünümleri (eski liste arayüzü)
+        return self.placements
@@ -0,0 +1,175 @@
+"""İkili yükleme planı dosyası (.tlp).
+
+Yapı:
+    16 bayt önek   MAGIC (6) + sürüm (uint16) + başlık uzunluğu (uint32) + boş (4)
+    başlık         UTF-8 JSON: konteynerler (ölçü, tonaj, aks konumları/sınırları), ürün
+                   tablolarının kategori listeleri, ek bilgiler ve dizi dizini
+    veri           sütun dizileri, her biri 64 bayta hizalı ham bayt
+
+Diziler dosyadan bellek eşlemeyle (copy-on-write) okunur; plan açmak için
+yeniden paketleme ya da satır satır ayrıştırma gerekmez. Açılan planlar
+üzerinde değişiklik yapılabilir, dosya değişmez.
+"""
+import io
+import json
+import os
+import struct
+
+import numpy as np
+
+import models
+
+MAGIC = b"TLPLAN"
+VERSION = 1
+ALIGN = 64
+_PREFIX = struct.Struct("<6sHI4x")
+
+# ItemTable sütunları (ad, dtype)
+TABLE_COLUMNS = [("dims", "<f8"), ("weight", "<f8"), ("stop_order", "<i4"), ("dest_codes", "<i4"),
+                 ("color_codes", "<i4"), ("fragile", "|b1"), ("can_rotate", "|b1"), ("name_codes", "<i4"),
+                 ("position", "<f8"), ("rotation", "|i1")]
+# PlacementTable sütunları (yükleme sırasıyla)
+PLACEMENT_COLUMNS = [("rows", "<i8"), ("pos", "<f8"), ("dims", "<f8"), ("fragile", "|b1")]
+
+def _align(n):
+    return -(-n // ALIGN) * ALIGN
+
+def save(target, containers, items=None, meta=None):
+    """Konteyner(ler)i ve isteğe bağlı manifest tablosunu yazar.
+
+    target dosya yolu ya da yazılabilir ikili dosya nesnesidir.
+    Aynı ItemTable'ı paylaşan konteynerler için tablo bir kez yazılır.
+    meta JSON'a yazılabilir ek bilgidir (ör. arama geçmişi).
+    """
+    if isinstance(containers, models.Container):
+        containers = [containers]
+    tables, table_ids = [], {}
+    def table_id(table):
+        if table is None: return None
+        if id(table) not in table_ids:
+            table_ids[id(table)] = len(tables)
+            tables.append(table)
+        return table_ids[id(table)]
+
+    header = {"containers": [], "tables": [], "items": None, "meta": meta or {}, "arrays": {}}
+    arrays = []
+    def add_array(name, values, dtype):
+        values = np.ascontiguousarray(values, dtype=dtype)
+        offset = _align(sum(_align(a.nbytes) for _, a in arrays))
+        header["arrays"][name] = {"dtype": dtype, "shape": list(values.shape), "offset": offset}
+        arrays.append((name, values))
+
+    for c, container in enumerate(containers):
+        placements = container.placements
+        header["containers"].append({
+            "dims": list(container.dims), "max_weight": container.max_weight,
+            "vehicle_type": container.vehicle_type,
+            "axle_front_pos": container.axle_front_pos, "axle_rear_pos": container.axle_rear_pos,
+            "axle_front_limit": container.axle_front_limit, "axle_rear_limit": container.axle_rear_limit,
+            "table": table_id(placements.items),
+        })
+        for name, dtype in PLACEMENT_COLUMNS:
+            add_array(f"c{c}.{name}", getattr(placements, name), dtype)
+    if items is not None:
+        header["items"] = table_id(items)
+    for t, table in enumerate(tables):
+        header["tables"].append({"destinations": table.destinations, "colors": table.colors, "names": table.names})
+        for name, dtype in TABLE_COLUMNS:
+            add_array(f"t{t}.{name}", getattr(table, name), dtype)
+
+    blob = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(blob))
+    if hasattr(target, "write"):
+        _write(target, blob, arrays, header, data_start)
+    else:
+        with open(target, "wb") as f:
+            _write(f, blob, arrays, header, data_start)
+
+def _write(f, blob, arrays, header, data_start):
+    f.write(_PREFIX.pack(MAGIC, VERSION, len(blob)))
+    f.write(blob)
+    for name, values in arrays:
+        f.seek(data_start + header["arrays"][name]["offset"])
+        f.write(memoryview(values).cast("B") if values.size else b"")
+    # Son dizi de hizalama dolgusuyla biter (dosya boyu dizinle tutarlı)
+    f.truncate(data_start + sum(_align(a.nbytes) for _, a in arrays))
+
+def _read(source):
+    """(başlık, veri baytları) döndürür; dosya yolu bellek eşlenir."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            prefix = f.read(_PREFIX.size)
+            magic, version, length = _check(prefix)
+            header = json.loads(f.read(length))
+        buffer = np.memmap(source, dtype=np.uint8, mode="c")
+    else:
+        raw = source.read() if hasattr(source, "read") else bytes(source)
+        magic, version, length = _check(raw[:_PREFIX.size])
+        header = json.loads(raw[_PREFIX.size:_PREFIX.size + length])
+        buffer = np.frombuffer(bytearray(raw), dtype=np.uint8)
+    return header, buffer, _align(_PREFIX.size + length)
+
+def _check(prefix):
+    if len(prefix) < _PREFIX.size:
+        raise ValueError("Not a TetraLog plan file")
+    magic, version, length = _PREFIX.unpack(prefix)
+    if magic != MAGIC:
+        raise ValueError("Not a TetraLog plan file")
+    if version > VERSION:
+        raise ValueError(f"Plan file version {version} is newer than supported ({VERSION})")
+    return magic, version, length
+
+def load(source):
+    """Plan dosyasını açar (dosya yolu, bayt dizisi ya da dosya benzeri nesne).
+
+    Dönen sözlük: containers (Container listesi), items (kaydedilen manifest
+    tablosu ya da ilk konteynerin tablosu) ve meta.
+    """
+    header, buffer, data_start = _read(source)
+    def array(name):
+        spec = header["arrays"][name]
+        dtype = np.dtype(spec["dtype"])
+        start = data_start + spec["offset"]
+        count = int(np.prod(spec["shape"]))
+        return buffer[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+
+    tables = []
+    for t, spec in enumerate(header["tables"]):
+        col = {name: array(f"t{t}.{name}") for name, _ in TABLE_COLUMNS}
+        table = models.ItemTable(col["dims"], col["weight"], col["stop_order"], col["dest_codes"], spec["destinations"],
+                                 col["color_codes"], spec["colors"], col["fragile"], col["can_rotate"],
+                                 col["name_codes"], spec["names"], copy=False)
+        table.position, table.rotation = col["position"], col["rotation"]
+        tables.append(table)
+
+    containers = []
+    for c, spec in enumerate(header["containers"]):
+        container = models.Container(*spec["dims"], spec["max_weight"])
+        container.vehicle_type = spec["vehicle_type"]
+        container.axle_front_pos, container.axle_rear_pos = spec["axle_front_pos"], spec["axle_rear_pos"]
+        container.axle_front_limit, container.axle_rear_limit = spec.get("axle_front_limit"), spec.get("axle_rear_limit")
+        items = tables[spec["table"]] if spec["table"] is not None else None
+        container.placements = models.PlacementTable.from_arrays(items, *(array(f"c{c}.{name}") for name, _ in PLACEMENT_COLUMNS))
+        containers.append(container)
+
+    items = tables[header["items"]] if header["items"] is not None else (containers[0].placements.items if containers else None)
+    return {"containers": containers, "items": items, "meta": header["meta"]}
+
+def save_plan(target, plan):
+    """api.solve sonucunu (items, truck, fleet, history) yazar."""
+    save(target, plan["fleet"] or [plan["truck"]], plan["items"],
+         {"fleet": plan["fleet"] is not None, "history": plan["history"]})
+
+def dumps_plan(plan):
+    """save_plan ile aynı biçimi bayt olarak döndürür (ör. indirme butonu)."""
+    with io.BytesIO() as f:
+        save_plan(f, plan)
+        return f.getvalue()
+
+def load_plan(source):
+    """save_plan ile yazılan dosyayı api.solve sonucu biçiminde açar."""
+    loaded = load(source)
+    meta = loaded["meta"]
+    containers = loaded["containers"]
+    return {"items": loaded["items"], "truck": containers[0],
+            "fleet": containers if meta.get("fleet") else None, "history": meta.get("history")}
@@ -0,0 +1,51 @@
+"""Çoklu strateji (portföy) çözücü.
+
+Aynı manifest farklı sıralama stratejileriyle paralel olarak paketlenir,
+her plan puanlanır ve en iyisi seçilir. Girdi tablosu değiştirilmez; her
+varyant kendi kopyası üzerinde çalışır.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import algorithms
+
+STRATEGIES = ["balanced", "Density"]
+
+def default_variants(n_random=4, seed=0):
+    """Mevcut iki strateji + rastgele eşitlik bozmalı varyantlar."""
+    variants = [{"strategy": s, "seed": None} for s in STRATEGIES]
+    for k in range(n_random):
+        variants.append({"strategy": STRATEGIES[k % len(STRATEGIES)], "seed": seed + k})
+    return variants
+
+def score_plan(container):
+    """Planı (yerleşen adet, hacim, aks dengesi) olarak puanlar; büyük olan daha iyi."""
+    placements = container.placements
+    front, rear = container.axle_loads()
+    total = front + rear
+    # 1.0 = yük iki aksa eşit dağılmış
+    balance = 1 - abs(front - rear) / total if total else 1.0
+    return (len(placements), float(placements.volume.sum()), balance)
+
+def run_variant(items, container, variant, packer_options=None):
+    """Tek varyantı boş bir konteyner kopyasında çalıştırır."""
+    truck = container.empty_copy()
+    packer = algorithms.Packer(truck, **(packer_options or {}))
+    packer.pack(items.copy(), variant["strategy"], variant.get("seed"))
+    return {"variant": variant, "score": score_plan(truck), "container": truck}
+
+def solve(items, container, variants=None, max_workers=None, packer_options=None):
+    """Tüm varyantları çalıştırır; (en iyi konteyner, sonuç listesi) döndürür.
+
+    Sonuç listesi puana göre en iyiden kötüye sıralıdır. max_workers=1 ise
+    süreç havuzu kullanılmadan sırayla çalışılır.
+    """
+    variants = variants or default_variants()
+    if max_workers == 1:
+        results = [run_variant(items, container, v, packer_options) for v in variants]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(run_variant, items, container, v, packer_options) for v in variants]
+            results = [f.result() for f in futures]
+    # Eşit puanda varyant listesindeki ilk sıra kazanır (sıralama kararlı)
+    results.sort(key=lambda r: r["score"], reverse=True)
+    return results[0]["container"], results
@@ -0,0 +1,202 @@
+"""Yükleme planı PDF raporu (Streamlit bağımsız).
+
+Toplamlar (hacim, ağırlık, destinasyon/SKU grupları) plan başına bir kez
+vektörel olarak hesaplanır. Büyük planlarda birim başına satır yerine
+gruplanmış özet tablolar yazılır. plan_pdf, üretilen raporu plana bağlı
+olarak önbellekte tutar; arayüz raporu sadece indirme anında ister.
+"""
+import datetime
+import weakref
+
+import numpy as np
+
+_report_class = None
+
+# "auto" modunda bu sayıdan fazla yerleşimde birim tablosu yerine gruplar yazılır
+DETAIL_LIMIT = 1000
+DETAILS = ("auto", "units", "grouped")
+
+# Plan (konteyner) başına son üretilen rapor: {konteyner: (imza, bayt)}
+_PDF_CACHE = weakref.WeakKeyDictionary()
+
+def _pdf_class():
+    """fpdf sadece rapor istendiğinde yüklenir (toplu çalıştırmalarda açılış süresi)."""
+    global _report_class
+    if _report_class is None:
+        from fpdf import FPDF
+
+        class PDFReport(FPDF):
+            def header(self):
+                self.set_font('Arial', 'B', 14)
+                self.set_text_color(15, 23, 42)
+                self.cell(0, 10, 'TETRALOG | Enterprise Load Plan', 0, 0, 'L')
+                self.ln(20)
+            def footer(self):
+                self.set_y(-15)
+                self.set_font('Arial', 'I', 8)
+                self.set_text_color(100, 116, 139)
+                self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
+
+        _report_class = PDFReport
+    return _report_class
+
+def tr(text):
+    replacements = {'ğ': 'g', 'ü': 'u', 'ş': 's', 'ı': 'i', 'ö': 'o', 'ç': 'c',
+                    'Ğ': 'G', 'Ü': 'U', 'Ş': 'S', 'İ': 'I', 'Ö': 'O', 'Ç': 'C'}
+    for s, t in replacements.items(): text = text.replace(s, t)
+    return text
+
+def _num(value):
+    # Tam sayılar ondalıksız yazılır (80.0 yerine 80)
+    value = float(value)
+    return str(int(value)) if value.is_integer() else str(value)
+
+def _groups(keys, volume, weight):
+    """Satır anahtarlarına göre (benzersiz anahtarlar, adet, hacim, ağırlık)."""
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    return (unique, np.bincount(inverse, minlength=len(unique)),
+            np.bincount(inverse, weights=volume, minlength=len(unique)),
+            np.bincount(inverse, weights=weight, minlength=len(unique)))
+
+def aggregates(truck, items):
+    """Rapor için tüm toplamları tek seferde hesaplar.
+
+    by_destination ve by_sku listeleri yüklenen birimlerin gruplarıdır
+    (SKU: orijinal ölçü + ağırlık + kırılganlık).
+    """
+    placements = truck.placements
+    table = placements.items
+    rows = placements.rows
+    volume = placements.volume
+    weight = placements.weight
+    total_volume = truck.dims[0] * truck.dims[1] * truck.dims[2]
+    used_volume = float(volume.sum())
+    total_weight = float(weight.sum())
+    result = {
+        "units": len(items), "placed": len(placements),
+        "total_volume_m3": total_volume / 1000000, "used_volume_m3": used_volume / 1000000,
+        "fill_rate": used_volume / total_volume,
+        "weight_kg": total_weight, "overweight": total_weight > truck.max_weight,
+        "by_destination": [], "by_sku": [],
+    }
+    if not len(placements):
+        return result
+
+    codes, count, vol, wgt = _groups(table.dest_codes[rows], volume, weight)
+    first_stop = np.full(len(codes), np.iinfo(np.int32).max)
+    np.minimum.at(first_stop, np.searchsorted(codes, table.dest_codes[rows]), table.stop_order[rows])
+    for n in np.argsort(first_stop, kind="stable"):
+        result["by_destination"].append({"destination": table.destinations[codes[n]], "stop": int(first_stop[n]),
+                                         "units": int(count[n]), "volume_m3": float(vol[n]) / 1000000, "weight_kg": float(wgt[n])})
+
+    skus = np.column_stack([table.dims[rows], table.weight[rows], table.fragile[rows]])
+    keys, count, vol, wgt = _groups(skus, volume, weight)
+    for n in np.argsort(-count, kind="stable"):
+        w, l, h, kg, fragile = keys[n]
+        result["by_sku"].append({"dims": f"{_num(w)}x{_num(l)}x{_num(h)}", "unit_kg": _num(kg),
+                                 "fragile": bool(fragile), "units": int(count[n]),
+                                 "volume_m3": float(vol[n]) / 1000000, "weight_kg": float(wgt[n])})
+    return result
+
+def _table(pdf, headers, widths, rows):
+    # Tablo Başlıkları
+    pdf.set_font('Arial', 'B', 9)
+    pdf.set_fill_color(15, 23, 42)
+    pdf.set_text_color(255, 255, 255)
+    for h, w in zip(headers, widths):
+        pdf.cell(w, 10, h, 1, 0, 'C', 1)
+    pdf.ln()
+
+    # Satırlar
+    pdf.set_font('Arial', '', 8)
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_fill_color(248, 250, 252)
+    for counter, row in enumerate(rows, 1):
+        fill = counter % 2 == 0
+        for r, w in zip(row, widths):
+            pdf.cell(w, 8, r, 1, 0, 'C', fill)
+        pdf.ln()
+
+def _unit_rows(truck):
+    placements = truck.placements
+    table = placements.items
+    dest = np.asarray(table.destinations, dtype=object)[table.dest_codes[placements.rows]]
+    for n, (dims, d, vol, kg) in enumerate(zip(placements.dims.tolist(), dest, placements.volume.tolist(),
+                                               placements.weight.tolist()), 1):
+        yield [str(n), tr(d), "x".join(map(_num, dims)), f"{vol/1000000:.3f}", _num(kg), "LOADED"]
+
+def build(truck, items, fitted_count, axle_data, detail="auto", stats=None):
+    """Rapor belgesini (FPDF nesnesi) oluşturur.
+
+    detail: "units" (birim başına satır), "grouped" (destinasyon ve SKU
+    özetleri) ya da "auto" (DETAIL_LIMIT'e göre seçer).
+    """
+    if detail not in DETAILS:
+        raise ValueError(f"Unknown report detail: {detail}")
+    stats = stats or aggregates(truck, items)
+    if detail == "auto":
+        detail = "units" if stats["placed"] <= DETAIL_LIMIT else "grouped"
+
+    pdf = _pdf_class()()
+    pdf.add_page()
+    total_vol, used_vol = stats["total_volume_m3"], stats["used_volume_m3"]
+    total_weight = stats["weight_kg"]
+
+    pdf.set_font('Arial', 'B', 11)
+    pdf.set_fill_color(241, 245, 249)
+    pdf.cell(0, 10, f'  EXECUTIVE SUMMARY - {datetime.datetime.now().strftime("%d-%m-%Y")}', 0, 1, fill=True)
+    pdf.ln(5)
+
+    pdf.set_font('Arial', '', 10)
+    pdf.cell(50, 10, tr('Loaded Units:'), 0, 0)
+    pdf.cell(50, 10, f"{fitted_count} / {len(items)}", 0, 1)
+    pdf.cell(50, 10, tr('Volume Usage:'), 0, 0)
+    pdf.cell(50, 10, f"%{(used_vol/total_vol)*100:.1f} ({used_vol:.2f} m3)", 0, 1)
+
+    pdf.cell(50, 10, tr('Total Weight:'), 0, 0)
+    if stats["overweight"]:
+        pdf.set_text_color(220, 38, 38)
+        pdf.cell(50, 10, f"{total_weight:.0f} kg (OVERWEIGHT!)", 0, 1)
+    else:
+        pdf.set_text_color(0, 0, 0)
+        pdf.cell(50, 10, f"{total_weight:.0f} kg", 0, 1)
+
+    pdf.ln(5)
+    pdf.set_text_color(0,0,0)
+    pdf.cell(50, 10, 'Axle Load:', 0, 0)
+    pdf.cell(50, 10, f"Front: {axle_data[0]:.0f}kg | Rear: {axle_data[1]:.0f}kg", 0, 1)
+
+    pdf.ln(10)
+    if detail == "units":
+        _table(pdf, ['#', 'Destination', 'Dims (cm)', 'Vol (m3)', 'Wgt (kg)', 'Status'],
+               [10, 50, 35, 25, 25, 45], _unit_rows(truck))
+        return pdf
+
+    _table(pdf, ['Stop', 'Destination', 'Units', 'Vol (m3)', 'Wgt (kg)'], [15, 65, 30, 40, 40],
+           ([str(g["stop"]), tr(g["destination"]), str(g["units"]), f"{g['volume_m3']:.2f}", f"{g['weight_kg']:.0f}"]
+            for g in stats["by_destination"]))
+    pdf.ln(10)
+    _table(pdf, ['SKU (cm)', 'Unit (kg)', 'Fragile', 'Units', 'Vol (m3)', 'Wgt (kg)'], [45, 25, 20, 25, 35, 40],
+           ([g["dims"], g["unit_kg"], "YES" if g["fragile"] else "", str(g["units"]), f"{g['volume_m3']:.2f}",
+             f"{g['weight_kg']:.0f}"] for g in stats["by_sku"]))
+    return pdf
+
+def create_pdf(truck, items, fitted_count, axle_data, detail="auto"):
+    return build(truck, items, fitted_count, axle_data, detail).output(dest='S').encode('latin-1')
+
+def write_pdf(path, truck, items, axle_data, detail="auto"):
+    """Raporu bellekte bayt dizisine çevirmeden doğrudan dosyaya yazar."""
+    build(truck, items, len(truck.placements), axle_data, detail).output(path, 'F')
+
+def plan_pdf(truck, items, axle_data, detail="auto"):
+    """create_pdf'in plan başına önbellekli sürümü (ör. indirme butonu).
+
+    Yerleşim sayısı, manifest, aks yükleri ya da detay değişmedikçe aynı
+    bayt dizisi döndürülür.
+    """
+    signature = (len(truck.placements), id(items), len(items), detail, tuple(round(float(a), 1) for a in axle_data))
+    cached = _PDF_CACHE.get(truck)
+    if cached is None or cached[0] != signature:
+        cached = _PDF_CACHE[truck] = (signature, create_pdf(truck, items, len(truck.placements), axle_data, detail))
+    return cached[1]
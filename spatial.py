@@ -0,0 +1,109 @@
+import math
+
+
+class BruteForceIndex:
+    """Referans uygulama: her sorguda tüm kutuları tarar (O(n))."""
+    def __init__(self, dims=None):
+        self.boxes = [] # (x0, y0, z0, x1, y1, z1)
+        self.items = []
+
+    def insert(self, pos, dims, item=None):
+        self.boxes.append((pos[0], pos[1], pos[2], pos[0] + dims[0], pos[1] + dims[1], pos[2] + dims[2]))
+        self.items.append(item)
+        return len(self.boxes) - 1
+
+    def _candidates(self, lo, hi):
+        return range(len(self.boxes))
+
+    def collides(self, pos, dims):
+        x0, y0, z0 = pos[0], pos[1], pos[2]
+        x1, y1, z1 = x0 + dims[0], y0 + dims[1], z0 + dims[2]
+        boxes = self.boxes
+        for b in self._candidates((x0, y0, z0), (x1, y1, z1)):
+            b = boxes[b]
+            if (x0 < b[3] and x1 > b[0] and
+                y0 < b[4] and y1 > b[1] and
+                z0 < b[5] and z1 > b[2]):
+                return True
+        return False
+
+    def contains_point(self, point):
+        """Nokta bir kutunun içinde mi? (alt yüzeyler dahil, üst yüzeyler hariç)"""
+        x, y, z = point[0], point[1], point[2]
+        boxes = self.boxes
+        for b in self._candidates((x, y, z), (x, y, z)):
+            b = boxes[b]
+            if (b[0] <= x < b[3] and b[1] <= y < b[4] and b[2] <= z < b[5]):
+                return True
+        return False
+
+    def query(self, pos, dims):
+        """Verilen hacimle (pozitif hacimde) kesişen kutuların id listesi."""
+        x0, y0, z0 = pos[0], pos[1], pos[2]
+        x1, y1, z1 = x0 + dims[0], y0 + dims[1], z0 + dims[2]
+        boxes = self.boxes
+        found = []
+        for b in set(self._candidates((x0, y0, z0), (x1, y1, z1))):
+            bb = boxes[b]
+            if (x0 < bb[3] and x1 > bb[0] and
+                y0 < bb[4] and y1 > bb[1] and
+                z0 < bb[5] and z1 > bb[2]):
+                found.append(b)
+        found.sort()
+        return found
+
+class GridIndex(BruteForceIndex):
+    """Konteyner boyutlarına göre uniform grid.
+
+    Her kutu kapladığı hücrelere kaydedilir; sorgular sadece komşu hücrelerdeki
+    kutulara bakar. Yerleştirme sırasında artımlı olarak güncellenir.
+    """
+    def __init__(self, dims, cell=60):
+        super().__init__()
+        self.cell = cell
+        self.shape = [max(1, int(math.ceil(d / cell))) for d in dims]
+        self.cells = [[] for _ in range(self.shape[0] * self.shape[1] * self.shape[2])]
+
+    def _span(self, lo, hi, axis):
+        # Yarı açık [lo, hi) aralığının kapladığı hücreler (sınırlara kırpılmış)
+        n = self.shape[axis]
+        a = min(max(int(lo // self.cell), 0), n - 1)
+        b = min(max(int(math.ceil(hi / self.cell)) - 1, a), n - 1)
+        return range(a, b + 1)
+
+    def _cell_ids(self, lo, hi):
+        nx, ny = self.shape[0], self.shape[1]
+        xs = self._span(lo[0], hi[0], 0)
+        ys = self._span(lo[1], hi[1], 1)
+        for k in self._span(lo[2], hi[2], 2):
+            for j in ys:
+                base = (k * ny + j) * nx
+                for i in xs:
+                    yield base + i
+
+    def insert(self, pos, dims, item=None):
+        box_id = super().insert(pos, dims, item)
+        b = self.boxes[box_id]
+        for c in self._cell_ids(b[:3], b[3:]):
+            self.cells[c].append(box_id)
+        return box_id
+
+    def _candidates(self, lo, hi):
+        cells = self.cells
+        for c in self._cell_ids(lo, hi):
+            yield from cells[c]
+
+# Destek kontrolü sonuç kodları
+SUPPORT_OK = 0
+SUPPORT_FRAGILE = 1 # Kırılgan kutunun üstüne basıyor
+SUPPORT_UNSTABLE = 2 # Temas oranı yetersiz
+
+INDEXES = {"grid": GridIndex, "brute": BruteForceIndex}
+
+def make_index(kind, dims):
+    """`kind` bir isim ("grid", "brute") ya da dims alan bir sınıf/fabrika olabilir."""
+    if isinstance(kind, str):
+        if kind not in INDEXES:
+            raise ValueError(f"Unknown spatial index: {kind}")
+        kind = INDEXES[kind]
+    return kind(dims)
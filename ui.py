@@ -1,6 +1,7 @@
 import streamlit as st
-from fpdf import FPDF
-import datetime
+
+# PDF raporu Streamlit gerektirmez; geriye uyumluluk için buradan da sunulur
+from report import create_pdf
 
 def apply_custom_css():
     st.markdown("""
@@ -42,80 +43,3 @@ def apply_custom_css():
         .stTabs [aria-selected="true"] { background-color: #ffffff !important; color: #3b82f6 !important; }
     </style>
     """, unsafe_allow_html=True)
-
-class PDFReport(FPDF):
-    def header(self):
-        self.set_font('Arial', 'B', 14)
-        self.set_text_color(15, 23, 42)
-        self.cell(0, 10, 'TETRALOG | Enterprise Load Plan', 0, 0, 'L')
-        self.ln(20)
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.set_text_color(100, 116, 139)
-        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
-
-def create_pdf(truck, items, fitted_count, axle_data):
-    pdf = PDFReport()
-    pdf.add_page()
-    def tr(text):
-        replacements = {'ğ': 'g', 'ü': 'u', 'ş': 's', 'ı': 'i', 'ö': 'o', 'ç': 'c', 
-                        'Ğ': 'G', 'Ü': 'U', 'Ş': 'S', 'İ': 'I', 'Ö': 'O', 'Ç': 'C'}
-        for s, t in replacements.items(): text = text.replace(s, t)
-        return text
-
-    total_vol = truck.dims[0]*truck.dims[1]*truck.dims[2] / 1000000 
-    used_vol = sum([i.volume for i in truck.placed_items]) / 1000000 
-    total_weight = sum([i.weight for i in truck.placed_items])
-    
-    pdf.set_font('Arial', 'B', 11)
-    pdf.set_fill_color(241, 245, 249)
-    pdf.cell(0, 10, f'  EXECUTIVE SUMMARY - {datetime.datetime.now().strftime("%d-%m-%Y")}', 0, 1, fill=True)
-    pdf.ln(5)
-    
-    pdf.set_font('Arial', '', 10)
-    pdf.cell(50, 10, tr('Loaded Units:'), 0, 0)
-    pdf.cell(50, 10, f"{fitted_count} / {len(items)}", 0, 1)
-    pdf.cell(50, 10, tr('Volume Usage:'), 0, 0)
-    pdf.cell(50, 10, f"%{(used_vol/total_vol)*100:.1f} ({used_vol:.2f} m3)", 0, 1)
-    
-    pdf.cell(50, 10, tr('Total Weight:'), 0, 0)
-    if total_weight > truck.max_weight:
-        pdf.set_text_color(220, 38, 38)
-        pdf.cell(50, 10, f"{total_weight} kg (OVERWEIGHT!)", 0, 1)
-    else:
-        pdf.set_text_color(0, 0, 0)
-        pdf.cell(50, 10, f"{total_weight} kg", 0, 1)
-    
-    pdf.ln(5)
-    pdf.set_text_color(0,0,0)
-    pdf.cell(50, 10, 'Axle Load:', 0, 0)
-    pdf.cell(50, 10, f"Front: {axle_data[0]:.0f}kg | Rear: {axle_data[1]:.0f}kg", 0, 1)
-
-    pdf.ln(10)
-    # Tablo Başlıkları
-    pdf.set_font('Arial', 'B', 9)
-    pdf.set_fill_color(15, 23, 42)
-    pdf.set_text_color(255, 255, 255)
-    headers = ['#', 'Destination', 'Dims (cm)', 'Vol (m3)', 'Wgt (kg)', 'Status']
-    widths = [10, 50, 35, 25, 25, 45]
-    for h, w in zip(headers, widths):
-        pdf.cell(w, 10, h, 1, 0, 'C', 1)
-    pdf.ln()
-    
-    # Satırlar
-    pdf.set_font('Arial', '', 8)
-    pdf.set_text_color(0, 0, 0)
-    counter = 1
-    for item in truck.placed_items:
-        fill = counter % 2 == 0
-        pdf.set_fill_color(248, 250, 252)
-        dims = item.get_dimension()
-        row = [str(counter), tr(item.destination), f"{dims[0]}x{dims[1]}x{dims[2]}", 
-               f"{item.volume/1000000:.3f}", str(item.weight), "LOADED"]
-        for r, w in zip(row, widths):
-            pdf.cell(w, 8, r, 1, 0, 'C', fill)
-        pdf.ln()
-        counter += 1
-        
-    return pdf.output(dest='S').encode('latin-1')
\ No newline at end of file
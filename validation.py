@@ -0,0 +1,181 @@
+"""Yükleme planı doğrulayıcı (paketleyiciden bağımsız).
+
+Herhangi bir yerleşim planını (Packer çıktısı ya da plan dosyası) toplu
+olarak kontrol eder: sınırlar, çakışma, destek oranı, kırılgan ürün üstüne
+yük, durak sırasına göre erişilebilirlik, tonaj ve dingil sınırları. Kutu
+çiftleri ikili karşılaştırma yerine Y ekseninde tarama (sweep and prune) ile
+üretilir; önden erişim kontrolü konteyner kesitinin 1 cm hücreli (x, z)
+ızgarasında yapılır.
+"""
+import numpy as np
+
+# Paketleyiciyle aynı kurallar
+MIN_SUPPORT = 0.60 # Tabanın en az %60'ı desteklenmeli
+TOUCH_TOLERANCE = 0.1 # Üst yüzey - taban temas toleransı (cm)
+EPS = 1e-6
+
+def _pairs(lo, hi, axis=1, max_pairs=1 << 20):
+    """`axis` boyunca aralıkları kesişen kutu çiftleri (a, b), parça parça.
+
+    Kutular başlangıca göre sıralanır; her kutunun ortakları, bitişinden önce
+    başlayan sonraki kutulardır (searchsorted ile tek adımda bulunur).
+    """
+    order = np.argsort(lo[:, axis], kind="stable")
+    start, end = lo[order, axis], hi[order, axis]
+    stop = np.searchsorted(start, end - EPS, side="left")
+    counts = np.maximum(stop - np.arange(len(order)) - 1, 0)
+    cum = np.cumsum(counts)
+    first = 0
+    while first < len(order):
+        # Bu parçada en fazla max_pairs çift olacak şekilde kutu aralığı
+        last = max(first + 1, int(np.searchsorted(cum, (cum[first - 1] if first else 0) + max_pairs, side="right")))
+        c = counts[first:last]
+        i = np.repeat(np.arange(first, last), c)
+        # Her i için i+1, i+2, ... ortakları
+        offsets = np.arange(c.sum()) - np.repeat(np.cumsum(c) - c, c)
+        j = i + 1 + offsets
+        yield order[i], order[j]
+        first = last
+
+def _overlap(lo, hi, a, b, axes):
+    return [np.minimum(hi[a, k], hi[b, k]) - np.maximum(lo[a, k], lo[b, k]) for k in axes]
+
+def _cells(lo, hi):
+    """[lo, hi) aralığının dokunduğu ve tam kapladığı 1 cm hücre aralıkları."""
+    a, b = np.round(lo), np.round(hi)
+    # Kayan nokta sapmaları (1e-9 altı) hücre sınırı sayılır
+    a_edge, b_edge = np.abs(lo - a) > 1e-9, np.abs(hi - b) > 1e-9
+    outer = np.where(a_edge, np.floor(lo), a), np.where(b_edge, np.ceil(hi), b)
+    inner = np.where(a_edge, np.ceil(lo), a), np.where(b_edge, np.floor(hi), b)
+    return [np.asarray(v, dtype=np.int64) for v in outer + inner]
+
+def _blocked_front(lo, hi, stop, dims):
+    """Kapı (y = L) tarafında, önünde daha geç teslim edilecek bir kutu olanlar.
+
+    Kapıdan içeri doğru taranır; konteynerin (x, z) kesitindeki 1 cm hücreli
+    ızgarada her hücre için o ana kadar görülen en büyük durak numarası tutulur
+    (bellek kutu sayısından bağımsız). Kutunun tam kapladığı hücrelerde bulunan
+    değer kesin ihlaldir; sadece kısmen kapladığı kenar hücrelerinde bulunursa
+    (kesirli ölçüler, kenar teması) önündeki kutularla tam aralık kontrolü yapılır.
+    """
+    W, H = int(np.ceil(dims[0])), int(np.ceil(dims[2]))
+    x0, x1, ix0, ix1 = _cells(lo[:, 0], hi[:, 0])
+    z0, z1, iz0, iz1 = _cells(lo[:, 2], hi[:, 2])
+    # Izgara dışına taşan kutular (out_of_bounds) her zaman tam kontrol edilir
+    inside = (x0 >= 0) & (z0 >= 0) & (x1 <= W) & (z1 <= H)
+    # (x, z) izdüşümü alansız kutular kimseyi engellemez, engellenmez
+    solid = (hi[:, 0] - lo[:, 0] > EPS) & (hi[:, 2] - lo[:, 2] > EPS)
+    x0, z0 = np.clip(x0, 0, W), np.clip(z0, 0, H)
+    x1, z1 = np.clip(x1, 0, W), np.clip(z1, 0, H)
+    grid = np.full((W, H), -np.inf)
+
+    inserts = np.argsort(-lo[:, 1], kind="stable") # Kapıya en yakın önce
+    queries = np.argsort(-hi[:, 1], kind="stable")
+    blocked = []
+    k = 0
+    for a in queries.tolist():
+        # Tamamen a'nın önünde kalan (y0 >= a.y1) kutular ızgaraya eklenir
+        while k < len(inserts) and lo[inserts[k], 1] >= hi[a, 1] - EPS:
+            b = inserts[k]
+            if solid[b]:
+                region = grid[x0[b]:x1[b], z0[b]:z1[b]]
+                np.maximum(region, stop[b], out=region)
+            k += 1
+        if not solid[a]:
+            continue
+        if inside[a]:
+            if grid[ix0[a]:ix1[a], iz0[a]:iz1[a]].max(initial=-np.inf) > stop[a]:
+                blocked.append(a)
+                continue
+            if grid[x0[a]:x1[a], z0[a]:z1[a]].max(initial=-np.inf) <= stop[a]:
+                continue
+        # Belirsiz: önündeki daha geç teslim edilecek kutularla kesişim alanı pozitif mi?
+        front = inserts[:k]
+        front = front[stop[front] > stop[a]]
+        ox = np.minimum(hi[front, 0], hi[a, 0]) - np.maximum(lo[front, 0], lo[a, 0])
+        oz = np.minimum(hi[front, 2], hi[a, 2]) - np.maximum(lo[front, 2], lo[a, 2])
+        if np.any((ox > EPS) & (oz > EPS)):
+            blocked.append(a)
+    return sorted(blocked)
+
+def validate(container, max_pairs=1 << 20):
+    """Konteynerdeki planı doğrular; ihlalleri sözlük olarak döndürür.
+
+    Kutu numaraları yerleşim (yükleme) sırasıdır. Dönen sözlük:
+        ok              hiç ihlal yoksa True
+        boxes           kutu sayısı
+        out_of_bounds   konteyner dışına taşan kutular
+        overlaps        çakışan (a, b) çiftleri
+        unsupported     (kutu, destek oranı): oran %60'ın altında
+        on_fragile      (üstteki, kırılgan alttaki) çiftleri
+        blocked         (kutu, "front"/"top"): önünde ya da üstünde daha geç
+                        teslim edilecek bir kutu var (kapı y = L tarafında)
+        overweight      tonaj aşımı (kg), yoksa 0
+        axle_overload   (dingil, yük, sınır): tanımlı dingil sınırını aşan yükler
+    """
+    placements = container.placements
+    n = len(placements)
+    lo = np.asarray(placements.pos, dtype=np.float64)
+    hi = lo + placements.dims
+    fragile = np.asarray(placements.fragile, dtype=bool)
+    items = placements.items
+    stop = items.stop_order[placements.rows].astype(np.float64) if n else np.zeros(0)
+    C = np.asarray(container.dims, dtype=np.float64)
+
+    report = {"boxes": n, "out_of_bounds": [], "overlaps": [], "unsupported": [],
+              "on_fragile": [], "blocked": [], "overweight": 0.0, "axle_overload": []}
+    if n == 0:
+        report["ok"] = True
+        return report
+
+    report["out_of_bounds"] = np.flatnonzero(np.any(lo < -EPS, axis=1) | np.any(hi > C + EPS, axis=1)).tolist()
+
+    contact = np.zeros(n)
+    for a, b in _pairs(lo, hi, 1, max_pairs):
+        ox, oy, oz = _overlap(lo, hi, a, b, (0, 1, 2))
+        clash = (ox > EPS) & (oy > EPS) & (oz > EPS)
+        report["overlaps"].extend(zip(np.minimum(a, b)[clash].tolist(), np.maximum(a, b)[clash].tolist()))
+
+        # Temas alanı iki yönde: (üst, alt) = (a, b) ve (b, a)
+        area = np.clip(ox, 0, None) * np.clip(oy, 0, None)
+        for top, bottom in ((a, b), (b, a)):
+            touching = (np.abs(hi[bottom, 2] - lo[top, 2]) < TOUCH_TOLERANCE) & (area > 0)
+            contact += np.bincount(top[touching], weights=area[touching], minlength=n)
+            hit = touching & fragile[bottom]
+            report["on_fragile"].extend(zip(top[hit].tolist(), bottom[hit].tolist()))
+            late = touching & (stop[top] > stop[bottom])
+            report["blocked"].extend((t, "top") for t in np.unique(bottom[late]).tolist())
+
+    base = (hi[:, 0] - lo[:, 0]) * (hi[:, 1] - lo[:, 1])
+    ratio = contact / base
+    lifted = (lo[:, 2] > EPS) & (ratio < MIN_SUPPORT)
+    report["unsupported"] = [(i, round(float(ratio[i]), 3)) for i in np.flatnonzero(lifted).tolist()]
+
+    report["blocked"].extend((a, "front") for a in _blocked_front(lo, hi, stop, C))
+    report["blocked"] = sorted(set(report["blocked"]))
+    report["overlaps"].sort()
+    report["on_fragile"].sort()
+
+    weight = items.weight[placements.rows]
+    if container.max_weight is not None:
+        report["overweight"] = max(0.0, float(weight.sum()) - container.max_weight)
+    # Dingil yükleri yerleşim toplamlarına güvenmeden kutulardan yeniden hesaplanır
+    front, rear = container.axle_split(float(weight.sum()), float(weight @ ((lo[:, 1] + hi[:, 1]) / 2)))
+    for axle, load, limit in (("front", front, container.axle_front_limit), ("rear", rear, container.axle_rear_limit)):
+        if limit is not None and load > limit + EPS:
+            report["axle_overload"].append((axle, round(load, 1), limit))
+
+    report["ok"] = not any(report[k] for k in ("out_of_bounds", "overlaps", "unsupported", "on_fragile", "blocked",
+                                               "overweight", "axle_overload"))
+    return report
+
+def summary(report):
+    """Raporun tek satırlık özeti (ihlal türü başına sayı)."""
+    if report["ok"]:
+        return f"OK ({report['boxes']} boxes)"
+    parts = [f"{k.replace('_', ' ')}: {len(report[k])}" for k in
+             ("out_of_bounds", "overlaps", "unsupported", "on_fragile", "blocked") if report[k]]
+    if report["overweight"]:
+        parts.append(f"overweight: {report['overweight']:.0f} kg")
+    parts.extend(f"{axle} axle: {load:.0f}/{limit:.0f} kg" for axle, load, limit in report["axle_overload"])
+    return ", ".join(parts)
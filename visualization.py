@@ -1,3 +1,5 @@
+import weakref
+
 import plotly.graph_objects as go
 import numpy as np
 
@@ -52,6 +54,177 @@ def get_wireframe_traces(items):
         
     return go.Scatter3d(x=x_lines, y=y_lines, z=z_lines, mode='lines', line=dict(color='#1e293b', width=2), hoverinfo='skip', showlegend=False)
 
+# Birim küpün 8 köşesi (get_cube_trace ile aynı sıra) ve 12 üçgen yüzü
+_CORNERS = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+                     [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]], dtype=float)
+_FACES = np.array([[7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2],
+                   [3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3],
+                   [0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6]]).T
+
+# Tel kafes kenarları: köşe çarpanları, NaN çizgi kesmesi (get_wireframe_traces ile aynı yol)
+_EDGES = np.array([
+    [0, 1, 1, 0, 0, np.nan, 0, 1, 1, 0, 0, np.nan, 0, 0, np.nan, 1, 1, np.nan, 1, 1, np.nan, 0, 0, np.nan],
+    [0, 0, 1, 1, 0, np.nan, 0, 0, 1, 1, 0, np.nan, 0, 0, np.nan, 0, 0, np.nan, 1, 1, np.nan, 1, 1, np.nan],
+    [0, 0, 0, 0, 0, np.nan, 1, 1, 1, 1, 1, np.nan, 0, 1, np.nan, 0, 1, np.nan, 0, 1, np.nan, 0, 1, np.nan],
+]).T
+
+def _compact(values):
+    """Tam sayı değerli dizileri uint16'ya, diğerlerini float32'ye indirir (daha küçük figür)."""
+    if len(values) and values.min() >= 0 and values.max() <= np.iinfo(np.uint16).max and np.all(values == np.round(values)):
+        return values.astype(np.uint16)
+    return values.astype(np.float32)
+
+class PlanGeometry:
+    """Bir planın çizim geometrisi: plan başına bir kez kurulur, her adımda dilimlenir.
+
+    Yerleşimler yükleme sırasında tutulduğu için ilk `step` kutu, her renk
+    grubunun köşe/yüz tamponlarının bir önekidir; adım değişince yeniden
+    hesaplama yapılmaz.
+    """
+    def __init__(self, placements):
+        self.count = n = len(placements)
+        self.items = items = placements.items
+        self.rows = rows = placements.rows.copy()
+        pos, dims = placements.pos.copy(), placements.dims.copy()
+        self.vertices = pos[:, None, :] + dims[:, None, :] * _CORNERS[None] # (n, 8, 3)
+        self.hover = np.column_stack([dims, items.weight[rows]]) if n else np.zeros((0, 4))
+
+        lines = (pos[:, None, :] + dims[:, None, :] * _EDGES[None]).reshape(-1, 3)
+        breaks = np.isnan(lines)
+        if np.all(lines[~breaks] == np.round(lines[~breaks])):
+            # Tam sayı koordinatlar düz metin olarak ikili float dizisinden daha kısa
+            lines = np.nan_to_num(lines).astype(np.int64).astype(object)
+            lines[breaks] = None
+        self.lines = lines
+        self._groups = {}
+
+    def _colors(self, color_mode):
+        items, rows = self.items, self.rows
+        if color_mode == "Weight Based":
+            # Ağırlığa göre koyuluk (get_cube_trace ile aynı gradyan)
+            opacity = np.clip(items.weight[rows] / 500, 0.4, 1.0)
+            return np.array([f"rgba(255, 0, 0, {o})" for o in opacity.tolist()])
+        return np.asarray(items.colors, dtype=object)[items.color_codes[rows]]
+
+    def groups(self, color_mode="Destination"):
+        """Renk + hover başlığı (destinasyon, rotasyon, kırılganlık) aynı olan kutu grupları."""
+        if color_mode in self._groups: return self._groups[color_mode]
+        items, rows = self.items, self.rows
+        groups = []
+        if self.count:
+            colors = self._colors(color_mode)
+            keys = np.column_stack([np.unique(colors, return_inverse=True)[1].ravel(), items.dest_codes[rows],
+                                    items.rotation[rows] == 1, items.fragile[rows]])
+            keys, group_of = np.unique(keys, axis=0, return_inverse=True)
+            group_of = group_of.ravel()
+            for g, (_, dest_code, rot, frag) in enumerate(keys.tolist()):
+                members = np.flatnonzero(group_of == g)
+                faces = (_FACES[None] + 8 * np.arange(len(members))[:, None, None]).reshape(-1, 3)
+                # Küçük veri tipleri: Plotly dizileri ikili (base64) olarak gönderir
+                faces = faces.astype(np.uint16 if len(members) * 8 <= np.iinfo(np.uint16).max else np.uint32)
+                destination = items.destinations[dest_code]
+                title = f"<b>{destination}</b>{' (Rotated)' if rot else ''}{' | 🥚 FRAGILE' if frag else ''}"
+                groups.append({
+                    "members": members, "color": colors[members[0]], "name": destination,
+                    "vertices": _compact(self.vertices[members].reshape(-1, 3)), "faces": faces,
+                    "customdata": _compact(np.repeat(self.hover[members], 8, axis=0)),
+                    "hovertemplate": title + "<br>Dims: %{customdata[0]}x%{customdata[1]}x%{customdata[2]}<br>Weight: %{customdata[3]} kg<extra></extra>",
+                })
+        self._groups[color_mode] = groups
+        return groups
+
+    def mesh_traces(self, color_mode="Destination", step=None):
+        """İlk `step` kutunun Mesh3d izleri (grup başına bir iz)."""
+        step = self.count if step is None else min(step, self.count)
+        traces = []
+        for g in self.groups(color_mode):
+            k = int(np.searchsorted(g["members"], step)) # Grubun ilk `step` içindeki kutu sayısı
+            if k == 0: continue
+            v, f = g["vertices"][:8 * k], g["faces"][:12 * k]
+            traces.append(go.Mesh3d(
+                x=v[:, 0], y=v[:, 1], z=v[:, 2], i=f[:, 0], j=f[:, 1], k=f[:, 2],
+                color=g["color"], opacity=0.9, flatshading=True, name=g["name"],
+                customdata=g["customdata"][:8 * k], hovertemplate=g["hovertemplate"]
+            ))
+        return traces
+
+    def wireframe_trace(self, step=None):
+        step = self.count if step is None else min(step, self.count)
+        lines = self.lines[:24 * step]
+        return go.Scatter3d(x=lines[:, 0], y=lines[:, 1], z=lines[:, 2], mode='lines',
+                            line=dict(color='#1e293b', width=2), hoverinfo='skip', showlegend=False)
+
+    def _segment_traces(self, color_mode, start, stop):
+        """[start, stop) yükleme aralığındaki kutuların izleri (renk grubu başına bir Mesh3d + çerçeve)."""
+        traces = []
+        for g in self.groups(color_mode):
+            a, b = np.searchsorted(g["members"], [start, stop]).tolist()
+            if a == b: continue
+            v, f = g["vertices"][8 * a:8 * b], g["faces"][12 * a:12 * b] - 8 * a
+            traces.append(go.Mesh3d(
+                x=v[:, 0], y=v[:, 1], z=v[:, 2], i=f[:, 0], j=f[:, 1], k=f[:, 2],
+                color=g["color"], opacity=0.9, flatshading=True, name=g["name"], showlegend=False,
+                customdata=g["customdata"][8 * a:8 * b], hovertemplate=g["hovertemplate"]
+            ))
+        lines = self.lines[24 * start:24 * stop]
+        traces.append(go.Scatter3d(x=lines[:, 0], y=lines[:, 1], z=lines[:, 2], mode='lines',
+                                   line=dict(color='#1e293b', width=2), hoverinfo='skip', showlegend=False))
+        return traces
+
+    def animated_figure(self, borders, color_mode="Destination", n_frames=30):
+        """Yükleme sırasını Plotly kareleri (frames) ile tarayıcıda oynatan figür.
+
+        Plan `n_frames` dilime bölünür ve her dilim kendi izlerini bir kez
+        taşır; kareler geometri göndermez, sadece dilimlerin görünürlüğünü değiştirir.
+        """
+        steps = np.unique(np.linspace(0, self.count, min(n_frames, self.count) + 1).astype(int)).tolist()
+        data, segment_of = [borders], [-1] # -1: kasa sınırları (hep görünür)
+        for s, (start, stop) in enumerate(zip(steps, steps[1:])):
+            traces = self._segment_traces(color_mode, start, stop)
+            data += traces
+            segment_of += [s] * len(traces)
+        segment_of = np.array(segment_of)
+
+        frames = []
+        for f, step in enumerate(steps):
+            visible = (segment_of < f).tolist() # f. karede ilk f dilim görünür
+            frames.append(go.Frame(data=[dict(visible=v) for v in visible[1:]],
+                                   traces=list(range(1, len(data))), name=str(step)))
+        fig = go.Figure(data=data, frames=frames)
+        play = dict(frame=dict(duration=150, redraw=True), transition=dict(duration=0), fromcurrent=True)
+        fig.update_layout(
+            updatemenus=[dict(type="buttons", showactive=False, x=0, y=0, xanchor="left", yanchor="top",
+                              buttons=[dict(label="▶", method="animate", args=[None, play]),
+                                       dict(label="❚❚", method="animate", args=[[None], dict(frame=dict(duration=0, redraw=False), mode="immediate")])])],
+            sliders=[dict(active=len(steps) - 1, x=0.1, len=0.9, currentvalue=dict(prefix="Loaded: "),
+                          steps=[dict(label=str(s), method="animate",
+                                      args=[[str(s)], dict(frame=dict(duration=0, redraw=True), mode="immediate")]) for s in steps])]
+        )
+        return fig
+
+# Plan başına geometri önbelleği (yerleşim tablosu silinince kendiliğinden düşer)
+_GEOMETRY_CACHE = weakref.WeakKeyDictionary()
+
+def plan_geometry(placements):
+    """Yerleşim tablosunun geometrisini döndürür; tablo değişmediyse önbellekten."""
+    cached = _GEOMETRY_CACHE.get(placements)
+    if cached is None or cached.count != len(placements):
+        cached = _GEOMETRY_CACHE[placements] = PlanGeometry(placements)
+    return cached
+
+def get_batched_mesh(placements, color_mode="Destination", count=None):
+    """Tüm kutuları renk grubu başına tek Mesh3d olarak çizer.
+
+    Köşe ve yüzler NumPy ile topluca üretilir; hover bilgisi metin yerine
+    sayısal customdata (ölçüler, ağırlık) olarak taşınır. `count` verilirse
+    sadece ilk `count` yerleşim (yükleme sırası) çizilir.
+    """
+    return plan_geometry(placements).mesh_traces(color_mode, count)
+
+def get_batched_wireframe(placements, count=None):
+    """get_wireframe_traces'in vektörel karşılığı (None ile ayrılmış tek çizgi izi)."""
+    return plan_geometry(placements).wireframe_trace(count)
+
 def draw_truck_borders(width, length, height):
     x = [0, width, width, 0, 0, 0, width, width, 0, 0, width, width, width, width, 0, 0]
     y = [0, 0, length, length, 0, 0, 0, length, length, 0, 0, 0, length, length, length, length]
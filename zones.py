@@ -0,0 +1,182 @@
+"""Durak bölgeli (stop-segmented) paketleme.
+
+Konteyner boyuna (Y ekseni) her durak için bir bölgeye ayrılır (küçük
+duraklar ardışık olarak aynı bölgede toplanır); bölge uzunluğu hacimden
+hesaplanır. Bölgeler ayrı süreçlerde paralel
+paketlenir, ardından LIFO sırasıyla (en geç durak kabine) art arda dizilir
+ve aralarındaki boşluk kapatılır. Bölgesine sığmayan birimler, bölge
+sıkıştırmadan kazanılan boya uzatılarak sırayla yeniden denenir; sonraki
+duraklar her zaman mevcut yükün önünden (kapı tarafı) başladığı için
+boşaltma sırası bozulmaz.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import algorithms
+import fleet
+import models
+
+# Bölge uzunluğu: durak hacmi bu doluluk oranında yerleşecek kadar. Bölgeler
+# duvar duvar (önce Y) dolduğu için fazla uzunluk sıkıştırmada geri kazanılır.
+ZONE_FILL = 0.5
+# Küçük duraklar ardışık gruplanır: her bölge en az bu uzunlukta yük taşır (cm).
+# Bölge sınırında yarım kalan duvarlar boşa gider; bölge çok incelirse kayıp büyür.
+MIN_ZONE_LENGTH = 150
+
+def group_stops(items, container):
+    """Durakları LIFO sırasıyla (en geç durak önce) ardışık bölge gruplarına ayırır.
+
+    Hacmi MIN_ZONE_LENGTH uzunluğunu doldurmayan duraklar sonraki durakla
+    aynı bölgeye alınır; son grup küçük kalırsa bir öncekine eklenir.
+    """
+    W, L, H = container.dims
+    minimum = W * H * MIN_ZONE_LENGTH * ZONE_FILL
+    groups, current, volume = [], [], 0.0
+    for stop in sorted(np.unique(items.stop_order).tolist(), reverse=True):
+        current.append(stop)
+        volume += float(items.volume[items.stop_order == stop].sum())
+        if volume >= minimum:
+            groups.append(current)
+            current, volume = [], 0.0
+    if current:
+        if groups: groups[-1].extend(current)
+        else: groups.append(current)
+    return groups
+
+def zone_lengths(items, container, groups):
+    """Her durak grubu için bölge uzunluğu (cm).
+
+    İhtiyaç toplamı konteyner boyunu aşarsa uzunluklar orantılı küçültülür;
+    kalan boy kapı tarafında boş kalır (yerleşmeyenler için).
+    """
+    W, L, H = container.dims
+    lengths = []
+    for stops in groups:
+        mask = np.isin(items.stop_order, stops)
+        d = items.dims[mask]
+        # En az bir birim sığsın: döndürülebilenler için kısa kenar yeterli
+        shortest = np.where(items.can_rotate[mask], d[:, :2].min(axis=1), d[:, 1]).max()
+        lengths.append(max(float(items.volume[mask].sum()) / (W * H * ZONE_FILL), float(shortest)))
+    total = sum(lengths)
+    if total > L:
+        lengths = [length * L / total for length in lengths]
+    return lengths
+
+class _FrontMap:
+    """(x, z) düzleminde 1 cm hücreli harita: her hücrede yükün en öndeki y değeri.
+
+    Hücreler kutuyu kaplayacak şekilde yuvarlanır (temkinli); kayma mesafesi
+    hiçbir zaman çakışma oluşturmaz.
+    """
+    def __init__(self, width, height):
+        self.front = np.zeros((int(np.ceil(width)), int(np.ceil(height))))
+
+    def _cells(self, pos, dims):
+        return (slice(int(np.floor(pos[0])), int(np.ceil(pos[0] + dims[0]))),
+                slice(int(np.floor(pos[2])), int(np.ceil(pos[2] + dims[2]))))
+
+    def limit(self, pos, dims):
+        return self.front[self._cells(pos, dims)].max(initial=0.0)
+
+    def update(self, pos, dims):
+        region = self.front[self._cells(pos, dims)]
+        np.maximum(region, pos[1] + dims[1], out=region)
+
+def _zone_container(container, length, weight_budget):
+    zone = models.Container(container.dims[0], length, container.dims[2], weight_budget)
+    zone.vehicle_type = container.vehicle_type
+    return zone
+
+def pack_zones(items, container, strategy="balanced", max_workers=None, packer_options=None):
+    """Manifesti durak bölgeleriyle `container`a paketler (yerinde).
+
+    Dönen sözlük: zones ((duraklar, başlangıç y, bitiş y) listesi, yükleme
+    sırasıyla), unplaced (hiç yerleşmeyen satırlar) ve fallback (bölgesi
+    kalan boya sığmadığı için kalan boyda sırayla paketlenen durak grupları).
+    max_workers=1 ise süreç havuzu kullanılmaz.
+    """
+    if len(container.placements):
+        raise ValueError("Zone packing needs an empty container")
+    if container.axle_front_limit is not None or container.axle_rear_limit is not None:
+        raise ValueError("Zone packing does not support axle limits")
+    packer_options = packer_options or {}
+    container.placements.bind(items)
+    L = container.dims[1]
+
+    # 1. LIFO: en geç durak kabine (y = 0) en yakın bölge
+    groups = group_stops(items, container)
+    lengths = zone_lengths(items, container, groups)
+    total_weight = float(items.weight.sum())
+    parts, zones = [], []
+    for stops, length in zip(groups, lengths):
+        rows = np.flatnonzero(np.isin(items.stop_order, stops))
+        part = items.take(rows)
+        budget = None
+        if container.max_weight is not None and total_weight > container.max_weight:
+            # Toplam tonaj aşılıyorsa bütçe durakların ağırlık payına göre bölünür
+            budget = container.max_weight * float(part.weight.sum()) / total_weight
+        parts.append((rows, part))
+        zones.append(_zone_container(container, length, budget))
+
+    # 2. Bölgeler paralel paketlenir
+    if max_workers == 1 or len(zones) == 1:
+        results = [fleet.pack_vehicle(part, zone, strategy, packer_options) for (_, part), zone in zip(parts, zones)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(fleet.pack_vehicle, part, zone, strategy, packer_options)
+                       for (_, part), zone in zip(parts, zones)]
+            results = [f.result() for f in futures]
+
+    # 3. Birleştirme + sıkıştırma: her bölge, önceki yüke değene kadar kabine kaydırılır
+    placements = container.placements
+    front = _FrontMap(container.dims[0], container.dims[2])
+    cursor = 0.0
+    layout, fallback = [], []
+    # Her bölgeden sonra gelen bölgelerin ayrılmış toplam uzunluğu ve yüklenmiş ağırlığı
+    reserved = np.cumsum(lengths[::-1])[::-1].tolist()[1:] + [0.0]
+    weights = [zone.placements.total_weight for zone, _ in results]
+    reserved_weight = np.cumsum(weights[::-1])[::-1].tolist()[1:] + [0.0]
+    for stops, (rows, part), (zone, unplaced), later, later_weight in zip(groups, parts, results, reserved,
+                                                                          reserved_weight):
+        p = zone.placements
+        # Alt süreçten dönen plan, durak tablosunun kendi kopyasına bağlıdır (rotasyonlar orada)
+        table = p.items if p.items is not None else part
+        extent = float((p.pos[:, 1] + p.dims[:, 1]).max()) if len(p) else 0.0
+        # Sığmayanlar, bölge sonraki bölgelere ayrılan boya kadar uzatılarak yeniden
+        # denenir. Sadece kendi durağının yükü arasına girebilir; önceki bölgelerin
+        # arkasına düşmez.
+        length = max(L - cursor - later, extent)
+        if cursor + extent > L:
+            # Önceki duraklar bölgelerinden taştı; bu durak kalan boya baştan paketlenir
+            # (sonraki bölgelere ayrılan boy kalmadıysa kalan boyun tamamına)
+            fallback.append(stops)
+            table = part
+            p = models.PlacementTable(table)
+            unplaced = np.arange(len(part))
+            length = L - cursor - later if L - cursor - later > 0 else L - cursor
+        if len(unplaced) and length > 0:
+            budget = None
+            if container.max_weight is not None:
+                # p (bölgenin yükü) genişletilmiş konteynerde zaten yüklü sayılır;
+                # sonraki bölgelerin paketlenmiş yükü de tonajdan ayrılır
+                budget = container.max_weight - placements.total_weight - later_weight
+            extended = _zone_container(container, length, budget)
+            extended.placements = p
+            packer = algorithms.Packer(extended, **packer_options)
+            packer.pack(table, order=unplaced[packer.loading_order(table.take(unplaced), strategy)])
+
+        # Katı kaydırma: her kutu, (x, z) izdüşümünde önündeki yükün arkasında kalır
+        boxes = list(zip(p.rows.tolist(), p.pos.tolist(), p.dims.tolist()))
+        offset = float(max([front.limit(pos, dims) - pos[1] for _, pos, dims in boxes] + [0.0]))
+        for sub_row, pos, dims in boxes:
+            shifted = [pos[0], pos[1] + offset, pos[2]]
+            placements.add(int(rows[sub_row]), shifted, int(table.rotation[sub_row]))
+            front.update(shifted, dims)
+        start = float(offset + min([pos[1] for _, pos, _ in boxes])) if boxes else cursor
+        if len(placements):
+            cursor = float((placements.pos[:, 1] + placements.dims[:, 1]).max())
+        layout.append((stops, start, cursor))
+
+    unplaced = np.setdiff1d(np.arange(len(items)), placements.rows)
+    return {"zones": layout, "unplaced": unplaced, "fallback": fallback}